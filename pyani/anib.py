@@ -81,25 +81,99 @@ qualifying matches contribute to the total aligned length, and total
 aligned sequence identity used to calculate ANI.
 """
 
+import hashlib
+import json
+import mmap
+import os
 import platform
 import re
+import shelve
 import shutil
 import subprocess
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import repeat
 from logging import Logger
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd  # type: ignore
 
-from Bio import SeqIO  # type: ignore
+from Bio.SeqIO.FastaIO import SimpleFastaParser  # type: ignore
 
+from . import __version__, PyaniException
 from . import pyani_config
 from . import pyani_files
 from . import pyani_jobs
 from .pyani_tools import ANIResults, BLASTcmds, BLASTexes, BLASTfunctions
 
 
+# Exception raised for problems with ANIb analysis or output
+class PyaniANIbException(PyaniException):
+
+    """ANIb-specific exception for pyani."""
+
+
+# Sequence line length in fragmented FASTA output (as for Biopython's SeqIO)
+FASTA_LINE_LENGTH = 60
+
+# Options common to all BLASTN+ command lines
+BLASTN_OPTIONS = (
+    "-xdrop_gap_final 150 -dust no -evalue 1e-15 -max_target_seqs 1 -outfmt "
+    "'6 qseqid sseqid length mismatch pident nident qlen slen "
+    "qstart qend sstart send positive ppos gaps'"
+)
+
+# Options common to all legacy BLAST (blastall) command lines
+BLASTALL_OPTIONS = "-X 150 -q -1 -F F -e 1e-15 -b 1 -v 1 -m 8"
+
+# Suffix for batched BLASTN output, which holds results for many query genomes
+# against a single database, and is split into pairwise .blast_tab files
+BATCH_SUFFIX = ".blast_batch"
+
+# Column names and types for the tabular output of BLASTN+ (ANIb) and legacy
+# BLASTALL (ANIblastall), in file order after the query ID. Supplying these
+# when reading .blast_tab files avoids per-file type inference by pandas.
+BLAST_TAB_COLUMNS = {
+    "ANIb": {
+        "sbjct_id": "category",
+        "blast_alnlen": "int64",
+        "blast_mismatch": "int64",
+        "blast_pid": "float64",
+        "blast_identities": "int64",
+        "qlen": "int64",
+        "slen": "int64",
+        "q_start": "int64",
+        "q_end": "int64",
+        "s_start": "int64",
+        "s_end": "int64",
+        "blast_pos": "int64",
+        "ppos": "float64",
+        "blast_gaps": "int64",
+    },
+    "ANIblastall": {
+        "sid": "category",
+        "blast_pid": "float64",
+        "blast_alnlen": "int64",
+        "blast_mismatch": "int64",
+        "blast_gaps": "int64",
+        "q_start": "int64",
+        "q_end": "int64",
+        "s_start": "int64",
+        "s_end": "int64",
+        "e_Value": "float64",
+        "bit_score": "float64",
+    },
+}  # type: Dict[str, Dict[str, str]]
+
+# The same types keyed by column position, as passed to pandas.read_csv
+BLAST_TAB_DTYPES = {
+    mode: dict(enumerate(["str"] + list(columns.values())))
+    for mode, columns in BLAST_TAB_COLUMNS.items()
+}  # type: Dict[str, Dict[int, str]]
+
+
 def get_version(blast_exe: Path = pyani_config.BLASTN_DEFAULT) -> str:
     """Return BLAST+ blastn version as a string.
 
@@ -155,21 +229,51 @@ def fragment_fasta_files(
     IDs.
     """
     outfnames = []
+    fraglength_dict = {}
     for fname in infiles:
         outfname = outdirname / f"{fname.stem}-fragments{fname.suffix}"
-        outseqs = []
+        fraglengths = {}
         count = 0
-        for seq in SeqIO.parse(fname, "fasta"):
-            idx = 0
-            while idx < len(seq):
-                count += 1
-                newseq = seq[idx : idx + fragsize]
-                newseq.id = "frag%05d" % count
-                outseqs.append(newseq)
-                idx += fragsize
+        # Input sequences are streamed one at a time, and each fragment is
+        # written as soon as it is cut, so only one input sequence is held
+        # in memory. Fragment lengths are recorded as fragments are written.
+        with open(fname, "r") as ifh, open(outfname, "w") as ofh:
+            for title, seq in SimpleFastaParser(ifh):
+                for idx in range(0, len(seq), fragsize):
+                    count += 1
+                    fragid = "frag%05d" % count
+                    fragment = seq[idx : idx + fragsize]
+                    ofh.write(f">{fragid} {title}\n" if title else f">{fragid}\n")
+                    lines = [
+                        fragment[pos : pos + FASTA_LINE_LENGTH]
+                        for pos in range(0, len(fragment), FASTA_LINE_LENGTH)
+                    ]
+                    ofh.write("\n".join(lines) + "\n")
+                    fraglengths[fragid] = len(fragment)
         outfnames.append(outfname)
-        SeqIO.write(outseqs, outfname, "fasta")
-    return outfnames, get_fraglength_dict(outfnames)
+        fraglength_dict[outfname.stem.split("-fragments")[0]] = fraglengths
+    return outfnames, fraglength_dict
+
+
+# Identify input genomes with identical contents
+def get_duplicate_genomes(infiles: List[Path]) -> Dict[str, str]:
+    """Return dictionary of duplicate genome names, keyed to an identical genome.
+
+    :param infiles:  list of paths to input FASTA files
+
+    Genomes are compared by the MD5 hash of their file contents, as in the
+    pyani genome index. Each genome whose contents match an earlier genome
+    in infiles maps to the name (file stem) of that first genome. Only the
+    first of a set of identical genomes needs to be fragmented and compared
+    with BLAST: process_blast() copies its results to the duplicates.
+    """
+    names = {}  # type: Dict[str, str]
+    duplicates = {}
+    for fname in infiles:
+        name = names.setdefault(pyani_files.create_hash(fname), fname.stem)
+        if name != fname.stem:
+            duplicates[fname.stem] = name
+    return duplicates
 
 
 # Get lengths of all sequences in all files
@@ -195,14 +299,30 @@ def get_fragment_lengths(fastafile: Path) -> Dict:
 
     :param fastafile:
 
-    Biopython's SeqIO module is used to parse all sequences in the FASTA
-    file.
+    The FASTA file is memory-mapped and scanned for header lines, without
+    decoding it or building a record for each sequence. The length of each
+    sequence is the number of bytes up to the next header, excluding line
+    breaks and spaces.
 
     NOTE: ambiguity symbols are not discounted.
     """
-    fraglengths = {}
-    for seq in SeqIO.parse(fastafile, "fasta"):
-        fraglengths[seq.id] = len(seq)
+    fraglengths = {}  # type: Dict[str, int]
+    with open(fastafile, "rb") as ifh:
+        if not os.fstat(ifh.fileno()).st_size:  # empty files cannot be mapped
+            return fraglengths
+        with mmap.mmap(ifh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = data.find(b">")
+            while start != -1:
+                seqstart = data.find(b"\n", start)
+                if seqstart == -1:  # header with no sequence at end of file
+                    seqstart = len(data)
+                nextstart = data.find(b"\n>", seqstart)
+                seqend = len(data) if nextstart == -1 else nextstart
+                title = data[start + 1 : seqstart].split(None, 1)
+                fraglengths[title[0].decode() if title else ""] = len(
+                    data[seqstart:seqend].translate(None, b" \r\n")
+                )
+                start = -1 if nextstart == -1 else nextstart + 1
     return fraglengths
 
 
@@ -229,6 +349,10 @@ def make_blastcmd_builder(
     format_exe: Optional[Path] = None,
     blast_exe: Optional[Path] = None,
     prefix: str = "ANIBLAST",
+    task: str = "blastn",
+    word_size: Optional[int] = None,
+    threads: int = 1,
+    batch: bool = False,
 ) -> BLASTcmds:
     """Return BLASTcmds object for construction of BLAST commands.
 
@@ -237,16 +361,33 @@ def make_blastcmd_builder(
     :param format_exe:
     :param blast_exe:
     :param prefix:
+    :param task:  str, blastn task (blastn or megablast; ANIb only)
+    :param word_size:  int, blastn word size for megablast (ANIb only)
+    :param threads:  int, number of threads for each blastn search (ANIb only)
+    :param batch:  bool, run one blastn search per database, with a batched
+        query file written by write_batch_queries() (ANIb only)
     """
     if mode == "ANIb":  # BLAST/formatting executable depends on mode
+        blastn_func = (
+            construct_blastn_batch_cmdline if batch else construct_blastn_cmdline
+        )  # type: Callable
         blastcmds = BLASTcmds(
-            BLASTfunctions(construct_makeblastdb_cmd, construct_blastn_cmdline),
+            BLASTfunctions(
+                construct_makeblastdb_cmd,
+                partial(
+                    blastn_func,
+                    threads=threads,
+                    task=task,
+                    word_size=word_size,
+                ),
+            ),
             BLASTexes(
                 format_exe or pyani_config.MAKEBLASTDB_DEFAULT,
                 blast_exe or pyani_config.BLASTN_DEFAULT,
             ),
             prefix,
             outdir,
+            batch,
         )
     else:
         blastcmds = BLASTcmds(
@@ -279,37 +420,49 @@ def make_job_graph(
     corresponding to the database creation are contained as dependencies.
     How those jobs are scheduled depends on the scheduler (see
     run_multiprocessing.py, run_sge.py)
+
+    If blastcmds was made with batch=True, there is one BLAST job for each
+    database, searching the batched query file for that database; these
+    files must be written first, with write_batch_queries().
     """
     joblist = []  # Holds list of job dependency graphs
 
     # Get dictionary of database-building jobs
     dbjobdict = build_db_jobs(infiles, blastcmds)
 
+    # Each genome's database is built by a single job, shared as a dependency
+    # by every BLAST job that uses that database
+    dbnames = [_.parent / _.name.replace("-fragments", "") for _ in fragfiles]
+
     # Create list of BLAST executable jobs, with dependencies
     jobnum = len(dbjobdict)
+    if blastcmds.batch:
+        for fname, dbname in zip(fragfiles, dbnames):
+            jobnum += 1
+            job = pyani_jobs.Job(
+                f"{blastcmds.prefix}_exe_{jobnum:06d}",
+                blastcmds.build_blast_cmd(
+                    get_batch_query_name(fname, blastcmds.outdir), dbname
+                ),
+            )
+            job.add_dependency(dbjobdict[dbname])
+            joblist.append(job)
+        return joblist
     for idx, fname1 in enumerate(fragfiles[:-1]):
-        for fname2 in fragfiles[idx + 1 :]:
+        for jdx, fname2 in enumerate(fragfiles[idx + 1 :], idx + 1):
             jobnum += 1
             jobs = [
                 pyani_jobs.Job(
                     f"{blastcmds.prefix}_exe_{jobnum:06d}_a",
-                    blastcmds.build_blast_cmd(
-                        fname1, fname2.parent / fname2.name.replace("-fragments", "")
-                    ),
+                    blastcmds.build_blast_cmd(fname1, dbnames[jdx]),
                 ),
                 pyani_jobs.Job(
                     f"{blastcmds.prefix}_exe_{jobnum:06d}_b",
-                    blastcmds.build_blast_cmd(
-                        fname2, fname1.parent / fname1.name.replace("-fragments", "")
-                    ),
+                    blastcmds.build_blast_cmd(fname2, dbnames[idx]),
                 ),
             ]
-            jobs[0].add_dependency(
-                dbjobdict[fname1.parent / fname1.name.replace("-fragments", "")]
-            )
-            jobs[1].add_dependency(
-                dbjobdict[fname2.parent / fname2.name.replace("-fragments", "")]
-            )
+            jobs[0].add_dependency(dbjobdict[dbnames[idx]])
+            jobs[1].add_dependency(dbjobdict[dbnames[jdx]])
             joblist.extend(jobs)
 
     # Return the dependency graph
@@ -322,25 +475,26 @@ def generate_blastdb_commands(
     outdir: Path,
     blastdb_exe: Optional[Path] = None,
     mode: str = "ANIb",
-) -> List[Tuple[str, Path]]:
-    """Return list of makeblastdb command-lines for ANIb/ANIblastall.
+) -> Iterator[Tuple[str, Path]]:
+    """Yield makeblastdb command-lines for ANIb/ANIblastall.
 
     :param filenames:  a list of paths to input FASTA files
     :param outdir:  path to output directory
     :param blastdb_exe:  path to the makeblastdb executable
     :param mode:  str, ANIb analysis type (ANIb or ANIblastall)
+
+    Command lines are generated as they are consumed, rather than collected
+    in a list.
     """
     if mode == "ANIb":
         construct_db_cmdline = construct_makeblastdb_cmd
     else:
         construct_db_cmdline = construct_formatdb_cmd
-    if blastdb_exe is None:
-        cmdlines = [construct_db_cmdline(fname, outdir) for fname in filenames]
-    else:
-        cmdlines = [
-            construct_db_cmdline(fname, outdir, blastdb_exe) for fname in filenames
-        ]
-    return cmdlines
+    for fname in filenames:
+        if blastdb_exe is None:
+            yield construct_db_cmdline(fname, outdir)
+        else:
+            yield construct_db_cmdline(fname, outdir, blastdb_exe)
 
 
 # Generate single makeblastdb command line
@@ -381,39 +535,65 @@ def generate_blastn_commands(
     outdir: Path,
     blast_exe: Optional[Path] = None,
     mode: str = "ANIb",
-) -> List[str]:
-    """Return a list of blastn command-lines for ANIm.
+    batch: bool = False,
+    threads: int = 1,
+    task: str = "blastn",
+    word_size: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield blastn command-lines for ANIb.
 
     :param filenames:  a list of paths to fragmented input FASTA files
     :param outdir:  path to output directory
     :param blastn_exe:  path to BLASTN executable
     :param mode:  str, analysis type (ANIb or ANIblastall)
+    :param batch:  bool, run one BLASTN+ search per database (ANIb only)
+    :param threads:  int, number of threads for each BLASTN+ search (ANIb only)
+    :param task:  str, blastn task (blastn or megablast; ANIb only)
+    :param word_size:  int, blastn word size for megablast (ANIb only)
 
     Assumes that the fragment sequence input filenames have the form
     ACCESSION-fragments.ext, where the corresponding BLAST database filenames
     have the form ACCESSION.ext. This is the convention followed by the
     fragment_FASTA_files() function above.
+
+    Command lines are generated as they are consumed, rather than collected
+    in a list, as there are two for every pair of input files.
+
+    With batch=True, there is one command for each database, searching a
+    single query file holding the fragments of all other genomes, so that
+    each database is loaded once, rather than once per query genome. The
+    query files must be written first, with write_batch_queries(). The
+    batched output is split into the usual pairwise .blast_tab files by
+    process_blast(..., batch=True).
     """
+    if batch and mode == "ANIb":
+        for fname in filenames:
+            yield construct_blastn_batch_cmdline(
+                get_batch_query_name(fname, outdir),
+                Path(str(fname).replace("-fragments", "")),
+                outdir,
+                blast_exe or pyani_config.BLASTN_DEFAULT,
+                threads=threads,
+                task=task,
+                word_size=word_size,
+            )
+        return
     if mode == "ANIb":
-        construct_blast_cmdline = construct_blastn_cmdline  # type: Callable
+        construct_blast_cmdline = partial(
+            construct_blastn_cmdline, threads=threads, task=task, word_size=word_size
+        )  # type: Callable
     else:
         construct_blast_cmdline = construct_blastall_cmdline
-    cmdlines = []
+    dbnames = [Path(str(_).replace("-fragments", "")) for _ in filenames]
     for idx, fname1 in enumerate(filenames[:-1]):
-        dbname1 = Path(str(fname1).replace("-fragments", ""))
-        for fname2 in filenames[idx + 1 :]:
-            dbname2 = Path(str(fname2).replace("-fragments", ""))
+        for jdx, fname2 in enumerate(filenames[idx + 1 :], idx + 1):
+            dbname1, dbname2 = dbnames[idx], dbnames[jdx]
             if blast_exe is None:
-                cmdlines.append(construct_blast_cmdline(fname1, dbname2, outdir))
-                cmdlines.append(construct_blast_cmdline(fname2, dbname1, outdir))
+                yield construct_blast_cmdline(fname1, dbname2, outdir)
+                yield construct_blast_cmdline(fname2, dbname1, outdir)
             else:
-                cmdlines.append(
-                    construct_blast_cmdline(fname1, dbname2, outdir, blast_exe)
-                )
-                cmdlines.append(
-                    construct_blast_cmdline(fname2, dbname1, outdir, blast_exe)
-                )
-    return cmdlines
+                yield construct_blast_cmdline(fname1, dbname2, outdir, blast_exe)
+                yield construct_blast_cmdline(fname2, dbname1, outdir, blast_exe)
 
 
 # Generate single BLASTN command line
@@ -422,6 +602,9 @@ def construct_blastn_cmdline(
     fname2: Path,
     outdir: Path,
     blastn_exe: Path = pyani_config.BLASTN_DEFAULT,
+    threads: int = 1,
+    task: str = "blastn",
+    word_size: Optional[int] = None,
 ) -> str:
     """Return a single blastn command.
 
@@ -429,17 +612,189 @@ def construct_blastn_cmdline(
     :param fname2:
     :param outdir:
     :param blastn_exe:  str, path to blastn executable
+    :param threads:  int, number of threads for blastn to use
+    :param task:  str, blastn task (blastn or megablast)
+    :param word_size:  int, word size for megablast
     """
-    prefix = outdir / f"{fname1.stem.replace('-fragments', '')}_vs_{fname2.stem}"
+    prefix = os.path.join(
+        outdir, f"{fname1.stem.replace('-fragments', '')}_vs_{fname2.stem}"
+    )
     return (
         f"{blastn_exe} -out {prefix}.blast_tab -query {fname1} -db {fname2} "
-        "-xdrop_gap_final 150 -dust no -evalue 1e-15 -max_target_seqs 1 -outfmt "
-        "'6 qseqid sseqid length mismatch pident nident qlen slen "
-        "qstart qend sstart send positive ppos gaps' "
-        "-task blastn"
+        f"{BLASTN_OPTIONS}{get_blastn_options(threads, task, word_size)}"
+    )
+
+
+# Generate single BLASTN command line for a batched query file
+def construct_blastn_batch_cmdline(
+    queryfile: Path,
+    dbname: Path,
+    outdir: Path,
+    blastn_exe: Path = pyani_config.BLASTN_DEFAULT,
+    threads: int = 1,
+    task: str = "blastn",
+    word_size: Optional[int] = None,
+) -> str:
+    """Return a single blastn command for a batched query file.
+
+    :param queryfile:  Path, batched query file from write_batch_queries()
+    :param dbname:  Path, path to BLAST database
+    :param outdir:  Path, path to output directory
+    :param blastn_exe:  str, path to blastn executable
+    :param threads:  int, number of threads for blastn to use
+    :param task:  str, blastn task (blastn or megablast)
+    :param word_size:  int, word size for megablast
+
+    Output is written to outdir, as DBNAME.blast_batch
+    """
+    outfname = os.path.join(outdir, f"{dbname.stem}{BATCH_SUFFIX}")
+    return (
+        f"{blastn_exe} -out {outfname} -query {queryfile} -db {dbname} "
+        f"{BLASTN_OPTIONS}{get_blastn_options(threads, task, word_size)}"
     )
 
 
+# Return blastn options for search task and number of threads
+def get_blastn_options(
+    threads: int = 1, task: str = "blastn", word_size: Optional[int] = None
+) -> str:
+    """Return blastn -task, -word_size and -num_threads options.
+
+    :param threads:  int, number of threads for blastn to use
+    :param task:  str, blastn task (blastn or megablast)
+    :param word_size:  int, word size for megablast
+
+    The word size is only set for megablast, defaulting to
+    pyani_config.MEGABLAST_WORD_SIZE. ANIb compares closely-related genomes,
+    so the larger megablast seeds lose little sensitivity and are much
+    faster than the blastn default. -num_threads is only given for more
+    than one thread: blastn threads are independent of the scheduler's
+    workers, so they can make use of idle cores when there are few
+    comparisons to run.
+    """
+    options = f" -task {task}"
+    if task == "megablast":
+        options += f" -word_size {word_size or pyani_config.MEGABLAST_WORD_SIZE}"
+    if threads > 1:
+        options += f" -num_threads {threads}"
+    return options
+
+
+# Write a batched query file for each genome's BLAST database
+def write_batch_queries(fragfiles: List[Path], outdir: Path) -> List[Path]:
+    """Return paths to batched query files, one for each fragmented genome.
+
+    :param fragfiles:  list of paths to fragmented FASTA files
+    :param outdir:  Path, path to output directory
+
+    The query file for each genome's database holds the fragments of all
+    other genomes (see write_batch_query()), and is named as returned by
+    get_batch_query_name().
+    """
+    return [
+        write_batch_query(
+            [_ for _ in fragfiles if _ != fname], get_batch_query_name(fname, outdir)
+        )
+        for fname in fragfiles
+    ]
+
+
+# Name the batched query file for a genome's BLAST database
+def get_batch_query_name(fragfile: Path, outdir: Path) -> Path:
+    """Return path to the batched query file for a genome's BLAST database.
+
+    :param fragfile:  Path, path to the genome's fragmented FASTA file
+    :param outdir:  Path, path to output directory
+    """
+    dbstem = fragfile.stem.replace("-fragments", "")
+    return outdir / f"{dbstem}{BATCH_SUFFIX}{fragfile.suffix}"
+
+
+# Write fragments from several genomes to a single batched query file
+def write_batch_query(fragfiles: List[Path], outfname: Path) -> Path:
+    """Return path to FASTA file holding all fragments in the passed files.
+
+    :param fragfiles:  list of paths to fragmented FASTA files
+    :param outfname:  Path, path to output FASTA file
+
+    Fragment IDs are prefixed with the name of the source genome, as
+    GENOME-fragNNNNN, so that BLAST output for each genome can be recovered
+    by split_blast_batches().
+    """
+    with open(outfname, "w") as ofh:
+        for fragfile in fragfiles:
+            qname = fragfile.stem.replace("-fragments", "")
+            with open(fragfile, "r") as ifh:
+                for line in ifh:
+                    if line.startswith(">"):
+                        line = f">{qname}-{line[1:]}"
+                    ofh.write(line)
+    return outfname
+
+
+# Split batched BLASTN output into pairwise .blast_tab files
+def split_blast_batches(
+    blast_dir: Path, genomes: List[str], logger: Optional[Logger] = None
+) -> List[Path]:
+    """Return paths to pairwise .blast_tab files split from batched output.
+
+    :param blast_dir:  Path, path to the directory containing batched output
+    :param genomes:  list of names of the genomes compared with BLASTN+
+    :param logger:  a logger for messages
+
+    Each DBNAME.blast_batch file is split into QUERY_vs_DBNAME.blast_tab
+    files, one for each query genome in the batched query file, with the
+    genome prefix removed from the fragment IDs. A genome with no hits gets
+    an empty .blast_tab file. Files already split from the current batched
+    output are not rewritten.
+
+    Every genome is queried against every other genome's database, so the
+    query genomes for each database are all of the passed genomes except
+    the database genome, rather than being read back from the (large)
+    batched query files. Batched output for a database that is not one of
+    the passed genomes is skipped with a warning; hits for a query genome
+    that is not expected raise a PyaniANIbException.
+    """
+    outfnames = []
+    batchfiles = sorted(blast_dir.glob(f"*{BATCH_SUFFIX}"))
+    if not batchfiles and logger:
+        logger.warning("No batched BLASTN+ output found in %s", blast_dir)
+    for batchfile in batchfiles:
+        sname = batchfile.stem
+        if sname not in genomes:
+            if logger:
+                logger.warning(
+                    "Subject name %s not in input sequence list, skipping %s",
+                    sname,
+                    batchfile,
+                )
+            continue
+        qnames = [_ for _ in genomes if _ != sname]
+        hits = {qname: [] for qname in qnames}  # type: Dict[str, List[str]]
+        tabfiles = {
+            qname: blast_dir / f"{qname}_vs_{sname}.blast_tab" for qname in hits
+        }
+        outfnames.extend(tabfiles.values())
+        batchtime = batchfile.stat().st_mtime_ns
+        if all(
+            _.is_file() and _.stat().st_mtime_ns >= batchtime for _ in tabfiles.values()
+        ):
+            continue
+        with open(batchfile, "r") as ifh:
+            for line in ifh:
+                qid, hit = line.split("\t", 1)
+                qname, fragid = qid.rsplit("-", 1)
+                if qname not in hits:
+                    raise PyaniANIbException(
+                        f"Unexpected query genome {qname} in {batchfile}"
+                    )
+                hits[qname].append(f"{fragid}\t{hit}")
+        for qname, tabfile in tabfiles.items():
+            with open(tabfile, "w") as ofh:
+                ofh.writelines(hits[qname])
+    return outfnames
+
+
 # Generate single BLASTALL command line
 def construct_blastall_cmdline(
     fname1: Path,
@@ -454,10 +809,12 @@ def construct_blastall_cmdline(
     :param outdir:
     :param blastall_exe:  str, path to BLASTALL executable
     """
-    prefix = outdir / f"{fname1.stem.replace('-fragments', '')}_vs_{fname2.stem}"
+    prefix = os.path.join(
+        outdir, f"{fname1.stem.replace('-fragments', '')}_vs_{fname2.stem}"
+    )
     return (
         f"{blastall_exe} -p blastn -o {prefix}.blast_tab -i {fname1} -d {fname2} "
-        "-X 150 -q -1 -F F -e 1e-15 -b 1 -v 1 -m 8"
+        f"{BLASTALL_OPTIONS}"
     )
 
 
@@ -468,6 +825,10 @@ def process_blast(
     fraglengths: Dict,
     mode: str = "ANIb",
     logger: Optional[Logger] = None,
+    workers: Optional[int] = None,
+    duplicates: Optional[Dict[str, str]] = None,
+    cache: bool = False,
+    batch: bool = False,
 ) -> ANIResults:
     """Return tuple of ANIb results for .blast_tab files in the output dir.
 
@@ -477,6 +838,19 @@ def process_blast(
         needed for BLASTALL output
     :param mode:  str, analysis type (ANIb or ANIblastall)
     :param logger:  a logger for messages
+    :param workers:  int, number of worker processes used to parse .blast_tab
+        files (defaults to the number of available cores)
+    :param duplicates:  dictionary of genomes that were not compared with BLAST,
+        keyed to the identical genome that was (see get_duplicate_genomes())
+    :param cache:  bool, reuse parsed values for .blast_tab files from a cache
+        in blast_dir (see get_parse_cache_key())
+    :param batch:  bool, split batched BLASTN+ output in blast_dir into
+        .blast_tab files first (see split_blast_batches())
+
+    With cache=True, parsed values for each .blast_tab file are kept in
+    blast_dir, so that rerunning the analysis over the same output only
+    parses new or changed files. The .blast_tab.dataframe file for a
+    .blast_tab file is only written when that file is parsed.
 
     Returns the following pandas dataframes in an ANIResults object;
     query sequences are rows, subject sequences are columns:
@@ -489,7 +863,10 @@ def process_blast(
     May throw a ZeroDivisionError if one or more BLAST runs failed, or a
     very distant sequence was included in the analysis.
     """
-    # Process directory to identify input files
+    # Process directory to identify input files, splitting batched output
+    if batch:
+        genomes = [_ for _ in org_lengths if _ not in (duplicates or {})]
+        split_blast_batches(blast_dir, genomes, logger)
     blastfiles = pyani_files.get_input_files(blast_dir, ".blast_tab")
     # Hold data in ANIResults object
     results = ANIResults(list(org_lengths.keys()), mode)
@@ -500,12 +877,14 @@ def process_blast(
 
     # Process .blast_tab files assuming that the filename format holds:
     # org1_vs_org2.blast_tab:
+    comparisons = []  # (query, subject) names for each file to be parsed
+    tabfiles = []
     for blastfile in blastfiles:
         qname, sname = blastfile.stem.split("_vs_")
 
         # We may have BLAST files from other analyses in the same directory
         # If this occurs, we raise a warning, and skip the file
-        if qname not in list(org_lengths.keys()):
+        if qname not in org_lengths:
             if logger:
                 logger.warning(
                     "Query name %s not in input sequence list, skipping %s",
@@ -513,7 +892,7 @@ def process_blast(
                     blastfile,
                 )
             continue
-        if sname not in list(org_lengths.keys()):
+        if sname not in org_lengths:
             if logger:
                 logger.warning(
                     "Subject name %s not in input sequence list, skipping %s",
@@ -521,19 +900,155 @@ def process_blast(
                     blastfile,
                 )
             continue
-        resultvals = parse_blast_tab(blastfile, fraglengths, mode)
-        query_cover = float(resultvals[0]) / org_lengths[qname]
-
-        # Populate dataframes: when assigning data, we need to note that
-        # we have asymmetrical data from BLAST output, so only the
-        # upper triangle is populated
-        results.add_tot_length(qname, sname, resultvals[0], sym=False)
-        results.add_sim_errors(qname, sname, resultvals[1], sym=False)
-        results.add_pid(qname, sname, 0.01 * resultvals[2], sym=False)
-        results.add_coverage(qname, sname, query_cover)
+        comparisons.append((qname, sname))
+        tabfiles.append(blastfile)
+
+    if cache:
+        # ANIblastall results depend on the query fragment lengths, so these
+        # are part of the cache key
+        digests = {}  # type: Dict[str, str]
+        if mode == "ANIblastall":
+            for qname in {qname for qname, _ in comparisons}:
+                digests[qname] = get_fraglength_digest(fraglengths[qname])
+        with shelve.open(str(blast_dir / pyani_config.BLAST_PARSE_CACHE)) as parsed:
+            cachekeys = [
+                get_parse_cache_key(tabfile, mode, digests.get(qname))
+                for (qname, _), tabfile in zip(comparisons, tabfiles)
+            ]
+            misses = [idx for idx, key in enumerate(cachekeys) if key not in parsed]
+            for idx, resultvals in zip(
+                misses,
+                parse_blast_tabs(
+                    [tabfiles[idx] for idx in misses],
+                    [comparisons[idx][0] for idx in misses],
+                    fraglengths,
+                    mode,
+                    workers,
+                ),
+            ):
+                parsed[cachekeys[idx]] = resultvals
+            allvals = [parsed[key] for key in cachekeys]
+    else:
+        allvals = parse_blast_tabs(
+            tabfiles, [qname for qname, _ in comparisons], fraglengths, mode, workers
+        )
+
+    # Populate dataframes: when assigning data, we need to note that we have
+    # asymmetrical data from BLAST output, so only the upper triangle is
+    # populated. Genome names are converted to row/column positions once, and
+    # each dataframe is filled in a single assignment, rather than cell by cell.
+    labels = results.percentage_identity.index
+    rows = labels.get_indexer([qname for qname, _ in comparisons])
+    cols = labels.get_indexer([sname for _, sname in comparisons])
+    for attr, values in (
+        ("alignment_lengths", [_[0] for _ in allvals]),
+        ("similarity_errors", [_[1] for _ in allvals]),
+        ("percentage_identity", [0.01 * _[2] for _ in allvals]),
+        (
+            "alignment_coverage",
+            [
+                float(vals[0]) / org_lengths[qname]
+                for (qname, _), vals in zip(comparisons, allvals)
+            ],
+        ),
+    ):
+        dfm = getattr(results, attr)
+        data = dfm.to_numpy(copy=True)
+        data[rows, cols] = values
+        setattr(results, attr, pd.DataFrame(data, index=labels, columns=labels))
+
+    # Duplicate genomes take the results of the genome they are identical to.
+    # Copying the row before the column sets comparisons between identical
+    # genomes to the self-comparison (diagonal) values. Identical genomes
+    # align over their full length, which is set explicitly, as alignment
+    # lengths have no default self-comparison value.
+    for dupname, name in (duplicates or {}).items():
+        for dfm in (
+            results.alignment_lengths,
+            results.similarity_errors,
+            results.percentage_identity,
+            results.alignment_coverage,
+        ):
+            dfm.loc[dupname, :] = dfm.loc[name, :]
+            dfm.loc[:, dupname] = dfm.loc[:, name]
+        identical = [dupname, name]
+        results.alignment_lengths.loc[identical, identical] = org_lengths[name]
     return results
 
 
+# Parse several .blast_tab files in parallel
+def parse_blast_tabs(
+    tabfiles: List[Path],
+    qnames: List[str],
+    fraglengths: Dict,
+    mode: str = "ANIb",
+    workers: Optional[int] = None,
+) -> List[Tuple[int, int, int]]:
+    """Return parse_blast_tab() results for each passed .blast_tab file.
+
+    :param tabfiles:  list of paths to .blast_tab files
+    :param qnames:  list of query genome names, one for each .blast_tab file
+    :param fraglengths:  dictionary of query sequence fragment lengths, only
+        needed for BLASTALL output
+    :param mode:  str, analysis type (ANIb or ANIblastall)
+    :param workers:  int, number of worker processes (defaults to the number
+        of available cores)
+
+    Each .blast_tab file is parsed independently, so the files are shared out
+    across a pool of worker processes. Only ANIblastall parsing needs the
+    fragment lengths, and then only for the query genome, so we avoid sending
+    the complete dictionary with every file.
+    """
+    if mode == "ANIblastall":
+        qfraglengths = [{qname: fraglengths[qname]} for qname in qnames]
+    else:
+        qfraglengths = [{}] * len(tabfiles)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                parse_blast_tab,
+                tabfiles,
+                qfraglengths,
+                repeat(mode),
+                chunksize=max(1, len(tabfiles) // (4 * workers)),
+            )
+        )
+
+
+# Identify a .blast_tab file in the cache of parsed results
+def get_parse_cache_key(
+    filename: Path, mode: str, fragdigest: Optional[str] = None
+) -> str:
+    """Return key for the parsed results of a .blast_tab file.
+
+    :param filename:  Path, path to .blast_tab file
+    :param mode:  str, analysis type (ANIb or ANIblastall)
+    :param fragdigest:  Optional[str], digest of the query genome fragment
+        lengths (see get_fraglength_digest()), only needed for BLASTALL output
+
+    The key changes if the file is rewritten, e.g. by rerunning BLAST, if
+    the pyani version changes, or if the query fragment lengths used to
+    parse BLASTALL output change.
+    """
+    stat = filename.stat()
+    key = f"{__version__}:{filename.name}:{stat.st_mtime_ns}:{stat.st_size}:{mode}"
+    if fragdigest is not None:
+        key += f":{fragdigest}"
+    return key
+
+
+# Summarise fragment lengths for the cache of parsed results
+def get_fraglength_digest(qfraglengths: Dict[str, int]) -> str:
+    """Return MD5 hex digest of a genome's fragment lengths.
+
+    :param qfraglengths:  Dict, fragment lengths keyed by fragment ID
+    """
+    return hashlib.md5(
+        json.dumps(qfraglengths, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
 # Parse BLASTALL output to get total alignment length and mismatches
 def parse_blast_tab(
     filename: Path, fraglengths: Dict, mode: str = "ANIb"
@@ -561,50 +1076,27 @@ def parse_blast_tab(
     # Load output as dataframe
     if mode == "ANIblastall":
         qfraglengths = fraglengths[qname]
-        columns = [
-            "sid",
-            "blast_pid",
-            "blast_alnlen",
-            "blast_mismatch",
-            "blast_gaps",
-            "q_start",
-            "q_end",
-            "s_start",
-            "s_end",
-            "e_Value",
-            "bit_score",
-        ]
-    else:
-        columns = [
-            "sbjct_id",
-            "blast_alnlen",
-            "blast_mismatch",
-            "blast_pid",
-            "blast_identities",
-            "qlen",
-            "slen",
-            "q_start",
-            "q_end",
-            "s_start",
-            "s_end",
-            "blast_pos",
-            "ppos",
-            "blast_gaps",
-        ]
+    columns = list(BLAST_TAB_COLUMNS[mode])
     # We may receive an empty BLASTN output file, if there are no significant
     # regions of homology. This causes pandas to throw an error on CSV import.
     # To get past this, we create an empty dataframe with the appropriate
     # columns.
     try:
-        data = pd.read_csv(filename, header=None, sep="\t", index_col=0)
+        data = pd.read_csv(
+            filename,
+            header=None,
+            sep="\t",
+            index_col=0,
+            dtype=BLAST_TAB_DTYPES[mode],
+            engine="c",
+        )
         data.columns = columns
     except pd.io.common.EmptyDataError:
         data = pd.DataFrame(columns=columns)
-    # Add new column for fragment length, only for BLASTALL
+    # Add new column for fragment length, only for BLASTALL. The lookup is
+    # mapped over the whole index at once, rather than row by row.
     if mode == "ANIblastall":
-        data["qlen"] = pd.Series(
-            [qfraglengths[idx] for idx in data.index], index=data.index
-        )
+        data["qlen"] = data.index.map(qfraglengths.__getitem__)
     # Add new columns for recalculated alignment length, proportion, and
     # percentage identity
     data["ani_alnlen"] = data["blast_alnlen"] - data["blast_gaps"]
@@ -613,8 +1105,10 @@ def parse_blast_tab(
     data["ani_pid"] = data["ani_alnids"] / data["qlen"]
     # Filter rows on 'ani_coverage' > 0.7, 'ani_pid' > 0.3
     filtered = data[(data["ani_coverage"] > 0.7) & (data["ani_pid"] > 0.3)]
-    # Dedupe query hits, so we only take the best hit
-    filtered = filtered.groupby(filtered.index).first()
+    # Dedupe query hits, so we only take the best hit. BLAST reports hits for
+    # each query best first, so we keep the first row for each query; this is
+    # a single vectorised mask, rather than a per-group reduction.
+    filtered = filtered[~filtered.index.duplicated(keep="first")].sort_index()
     # Replace NaNs with zero
     filtered = filtered.fillna(value=0)  # Needed if no matches
     # The ANI value is then the mean percentage identity.
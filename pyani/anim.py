@@ -334,7 +334,7 @@ def process_deltadir(
 
         # We may have .delta files from other analyses in the same directory
         # If this occurs, we raise a warning, and skip the .delta file
-        if qname not in list(org_lengths.keys()):
+        if qname not in org_lengths:
             if logger:
                 logger.warning(
                     "Query name %s not in input sequence list, skipping %s",
@@ -342,7 +342,7 @@ def process_deltadir(
                     deltafile,
                 )
             continue
-        if sname not in list(org_lengths.keys()):
+        if sname not in org_lengths:
             if logger:
                 logger.warning(
                     "Subject name %s not in input sequence list, skipping %s",
@@ -38,7 +38,6 @@
 # THE SOFTWARE.
 """Module providing functions useful for downloading genomes from NCBI."""
 
-import hashlib
 import logging
 import re
 import shlex
@@ -57,6 +56,7 @@ from urllib.error import HTTPError, URLError
 from Bio import Entrez  # type: ignore
 from tqdm import tqdm  # type: ignore
 
+from pyani.pyani_files import create_hash
 from pyani.pyani_tools import termcolor
 
 # Regular expression for NCBI taxon numbers
@@ -575,22 +575,6 @@ def create_labels(
     )
 
 
-# Create an MD5 hash for the passed genome
-def create_hash(fname: Path) -> str:
-    """Return MD5 hash of the passed file contents.
-
-    :param fname:  Path, path to file for hashing
-
-    We can ignore the Bandit B303 error as we're not using the hash for
-    cryptographic purposes.
-    """
-    hash_md5 = hashlib.md5()  # nosec
-    with open(fname, "rb") as fhandle:
-        for chunk in iter(lambda: fhandle.read(65536), b""):
-            hash_md5.update(chunk)
-    return hash_md5.hexdigest()
-
-
 # Create an MD5 hash for the passed genome
 def extract_hash(hashfile: Path, name: str) -> str:
     """Return MD5 hash from file of name:MD5 hashes.
@@ -86,12 +86,16 @@ ALIGNDIR = {
     "ANIblastall": "blastall_output",
 }
 
+# Name of the cache of parsed .blast_tab results kept in BLAST output directories
+BLAST_PARSE_CACHE = "_parse_cache"
+
 # Any valid matplotlib colour map can be used here
 # See, e.g. http://matplotlib.org/xkcd/examples/color/colormaps_reference.html
 MPL_CBAR = "Spectral"
 
 # Parameters for analyses
 FRAGSIZE = 1020  # Default ANIb fragment size
+MEGABLAST_WORD_SIZE = 28  # Default word size for ANIb with megablast
 
 # SGE/OGE scheduler parameters
 SGE_WAIT = 0.01  # Base unit of time (s) to wait between polling SGE
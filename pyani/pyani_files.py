@@ -38,11 +38,14 @@
 # THE SOFTWARE.
 """Code to handle files for average nucleotide identity calculations."""
 
+import hashlib
+
 from argparse import Namespace
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
 from Bio import SeqIO  # type: ignore
+from Bio.SeqIO.FastaIO import SimpleFastaParser  # type: ignore
 
 from pyani import PyaniException
 
@@ -117,15 +120,17 @@ def get_sequence_lengths(fastafilenames: Iterable[Path]) -> Dict[str, int]:
 
     :param fastafilenames:  Iterable[Path], paths to input FASTA files
 
-    Biopython's SeqIO module is used to parse all sequences in the FASTA
-    file corresponding to each organism, and the total base count in each
-    is obtained.
+    Biopython's SimpleFastaParser is used to parse all sequences in the
+    FASTA file corresponding to each organism, and the total base count in
+    each is obtained. Only sequence strings are needed, so no SeqRecord
+    objects are built.
 
     NOTE: ambiguity symbols are not discounted.
     """
     tot_lengths = {}
     for fname in fastafilenames:
-        tot_lengths[fname.stem] = sum([len(s) for s in SeqIO.parse(fname, "fasta")])
+        with open(fname, "r") as ifh:
+            tot_lengths[fname.stem] = sum(len(seq) for _, seq in SimpleFastaParser(ifh))
     return tot_lengths
 
 
@@ -197,3 +202,19 @@ def collect_existing_output(dirpath: Path, program: str, args: Namespace) -> Lis
         suffix = ".blast_tab"
     existingfiles = [fname for fname in dirpath.iterdir() if fname.suffix == suffix]
     return existingfiles
+
+
+# Create an MD5 hash for the passed genome
+def create_hash(fname: Path) -> str:
+    """Return MD5 hash of the passed file contents.
+
+    :param fname:  Path, path to file for hashing
+
+    We can ignore the Bandit B303 error as we're not using the hash for
+    cryptographic purposes.
+    """
+    hash_md5 = hashlib.md5()  # nosec
+    with open(fname, "rb") as fhandle:
+        for chunk in iter(lambda: fhandle.read(65536), b""):
+            hash_md5.update(chunk)
+    return hash_md5.hexdigest()
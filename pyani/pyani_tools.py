@@ -211,7 +211,12 @@ class BLASTcmds:
     """Class for construction of BLASTN and database formatting commands."""
 
     def __init__(
-        self, funcs: BLASTfunctions, exes: BLASTexes, prefix: str, outdir: Path
+        self,
+        funcs: BLASTfunctions,
+        exes: BLASTexes,
+        prefix: str,
+        outdir: Path,
+        batch: bool = False,
     ) -> None:
         """Instantiate class.
 
@@ -219,11 +224,14 @@ class BLASTcmds:
         :param exes:  BLASTexes, containing executables for this BLAST analysis
         :param prefix:  str, prefix for outputs from this BLAST analysis
         :param outdir:  Path to output directory for this BLAST analysis
+        :param batch:  bool, BLAST commands search batched query files, one
+            for each database
         """
         self.funcs = funcs
         self.exes = exes
         self.prefix = prefix
         self.outdir = outdir
+        self.batch = batch
 
     def build_db_cmd(self, fname: Path) -> str:
         """Return database format/build command.
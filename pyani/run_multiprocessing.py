@@ -43,15 +43,23 @@ Python's multiprocessing module to distribute command-line jobs.
 """
 
 import multiprocessing
+import re
+import shlex
+import shutil
 import subprocess
 import sys
 
+from functools import lru_cache
 from logging import Logger
 from typing import List, Optional
 
 from .pyani_jobs import Job
 
 
+# Characters with special meaning to the shell, when outside single quotes
+SHELL_SYNTAX = re.compile(r"""[|&;<>()$`\\"*?[\]{}~#\n]""")
+
+
 # Run a job dependency graph with multiprocessing
 def run_dependency_graph(
     jobgraph, workers: Optional[int] = None, logger: Optional[Logger] = None
@@ -124,18 +132,56 @@ def multiprocessing_run(cmdlines: List, workers: Optional[int] = None) -> int:
     # If workers is None or greater than the number of cores available,
     # it will be set to the maximum number of cores
     pool = multiprocessing.Pool(processes=workers)
-    results = [
-        pool.apply_async(
-            subprocess.run,
-            (str(cline),),
-            {
-                "shell": sys.platform != "win32",
-                "stdout": subprocess.PIPE,
-                "stderr": subprocess.PIPE,
-            },
+    results = []
+    for cline in cmdlines:
+        # Command lines that need no shell are run directly, as argument lists
+        args = None if sys.platform == "win32" else split_cmdline(str(cline))
+        results.append(
+            pool.apply_async(
+                subprocess.run,
+                (str(cline) if args is None else args,),
+                {
+                    "shell": args is None and sys.platform != "win32",
+                    "stdout": subprocess.PIPE,
+                    "stderr": subprocess.PIPE,
+                },
+            )
         )
-        for cline in cmdlines
-    ]
     pool.close()
     pool.join()
     return sum([r.get().returncode for r in results])
+
+
+# Split a command line into arguments, if it does not need the shell
+def split_cmdline(cline: str) -> Optional[List[str]]:
+    """Return command line as a list of arguments, or None if it needs a shell.
+
+    :param cline:  str, command line
+
+    A command line that uses no shell syntax (redirection, pipes, variables,
+    globs, etc.) outside single-quoted strings, and whose first word is an
+    executable found on $PATH (or a path to one), is split as the shell
+    would split it. It can then be run without starting a shell process.
+    A command line whose first word is not found on $PATH (e.g. a shell
+    builtin with no executable of the same name), or that cannot be split
+    (e.g. with an unbalanced quote in a path), is left to the shell.
+    """
+    if SHELL_SYNTAX.search(re.sub(r"'[^']*'", "", cline)):
+        return None
+    try:
+        args = shlex.split(cline)
+    except ValueError:
+        return None
+    if not args or which_exe(args[0]) is None:
+        return None
+    return args
+
+
+# Locate executables once, as every command line in a run is checked
+@lru_cache(maxsize=None)
+def which_exe(name: str) -> Optional[str]:
+    """Return path to the named executable, or None if it is not found.
+
+    :param name:  str, executable name or path
+    """
+    return shutil.which(name)
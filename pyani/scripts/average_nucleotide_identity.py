@@ -241,6 +241,13 @@ def parse_cmdline(argv: Optional[List] = None) -> Namespace:
         default=False,
         help="Skip BLASTN runs, for testing (e.g. if output already present)",
     )
+    parser.add_argument(
+        "--parse_cache",
+        dest="parse_cache",
+        action="store_true",
+        default=False,
+        help="Reuse parsed ANIb output from a cache in the output directory",
+    )
     parser.add_argument(
         "--noclobber",
         dest="noclobber",
@@ -368,6 +375,39 @@ def parse_cmdline(argv: Optional[List] = None) -> Namespace:
         type=Path,
         help="Path to BLASTN+ executable",
     )
+    parser.add_argument(
+        "--blastn_task",
+        dest="blastn_task",
+        action="store",
+        default="blastn",
+        choices=["blastn", "megablast"],
+        help="BLASTN+ search task for ANIb (default blastn)",
+    )
+    parser.add_argument(
+        "--word_size",
+        dest="word_size",
+        action="store",
+        default=None,
+        type=int,
+        help="BLASTN+ word size for ANIb with megablast "
+        "(default %i)" % pyani_config.MEGABLAST_WORD_SIZE,
+    )
+    parser.add_argument(
+        "--blastn_threads",
+        dest="blastn_threads",
+        action="store",
+        default=1,
+        type=int,
+        help="Number of threads for each BLASTN+ search for ANIb (default 1)",
+    )
+    parser.add_argument(
+        "--blastn_batch",
+        dest="blastn_batch",
+        action="store_true",
+        default=False,
+        help="Run one BLASTN+ search per genome database for ANIb, querying "
+        "the fragments of all other genomes at once",
+    )
     parser.add_argument(
         "--makeblastdb_exe",
         dest="makeblastdb_exe",
@@ -430,7 +470,11 @@ def parse_cmdline(argv: Optional[List] = None) -> Namespace:
     # Parse arguments
     if argv is None:
         argv = sys.argv[1:]
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    # The BLASTN+ word size is only passed to blastn for megablast searches
+    if args.word_size is not None and args.blastn_task != "megablast":
+        parser.error("--word_size can only be used with --blastn_task megablast")
+    return args
 
 
 # Report last exception as string
@@ -656,10 +700,25 @@ def run_blast(
             args, logger, infiles, blastdir
         )
 
+        # Batched BLASTN+ searches need a query file for each database
+        batch = args.blastn_batch and args.method == "ANIb"
+        if batch:
+            logger.info("Writing batched BLASTN+ query files to %s", blastdir)
+            anib.write_batch_queries(fragfiles, blastdir)
+
         # Run BLAST database-building and executables from a jobgraph
         logger.info("Creating job dependency graph")
         jobgraph = anib.make_job_graph(
-            infiles, fragfiles, anib.make_blastcmd_builder(args.method, blastdir)
+            infiles,
+            fragfiles,
+            anib.make_blastcmd_builder(
+                args.method,
+                blastdir,
+                task=args.blastn_task,
+                word_size=args.word_size,
+                threads=args.blastn_threads,
+                batch=batch,
+            ),
         )
         if args.scheduler == "multiprocessing":
             logger.info("Running dependency graph with multiprocessing")
@@ -734,14 +793,28 @@ def unified_anib(
     blastdir = args.outdirname / ALIGNDIR[args.method]
     logger.info("Writing BLAST output to %s", blastdir)
 
+    # Genomes with identical contents only need to be compared once
+    duplicates = anib.get_duplicate_genomes(infiles)
+    for dupname, name in duplicates.items():
+        logger.info("%s is identical to %s (not compared with BLAST)", dupname, name)
+
     # Build BLAST databases and run pairwise BLASTN
-    cumval, fraglengths = run_blast(args, logger, infiles, blastdir)
+    cumval, fraglengths = run_blast(
+        args, logger, [_ for _ in infiles if _.stem not in duplicates], blastdir
+    )
 
     # Process pairwise BLASTN output
     logger.info("Processing pairwise %s BLAST output.", args.method)
     try:
         data = anib.process_blast(
-            blastdir, org_lengths, fraglengths=fraglengths, mode=args.method
+            blastdir,
+            org_lengths,
+            fraglengths=fraglengths,
+            mode=args.method,
+            workers=args.workers,
+            duplicates=duplicates,
+            cache=args.parse_cache,
+            batch=args.blastn_batch and args.method == "ANIb",
         )
     except ZeroDivisionError:
         logger.error("One or more BLAST output files has a problem.")
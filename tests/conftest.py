@@ -38,25 +38,23 @@
 # THE SOFTWARE.
 """Pytest configuration file."""
 
-import copy
+import os
 import subprocess
 
-from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Tuple
+from typing import Dict, List
 
-import pandas as pd
 import pytest
 
-from pyani import download
-from pyani.download import ASMIDs, DLStatus, get_ncbi_esummary
 from pyani.pyani_config import (
     BLASTALL_DEFAULT,
     BLASTN_DEFAULT,
     NUCMER_DEFAULT,
     FRAGSIZE,
 )
-from pyani.scripts import genbank_get_genomes_by_taxon
+from tools import get_fna_paths, read_matrix_csv
 
 # Path to tests, contains tests and data subdirectories
 # This conftest.py file should be found in the top directory of the tests
@@ -64,157 +62,265 @@ from pyani.scripts import genbank_get_genomes_by_taxon
 TESTSPATH = Path(__file__).parents[0]
 FIXTUREPATH = TESTSPATH / "fixtures"
 
+# Arbitrary (nonexistent) input filenames, for command-line construction tests
+PATH_FILE_FOUR = tuple(Path(f"file{_:d}.fna") for _ in range(1, 5))
 
-@pytest.fixture
-def blastall_available():
-    """Returns True if blastall can be run, False otherwise."""
-    cmd = str(BLASTALL_DEFAULT)
-    # Can't use check=True, as blastall without arguments returns 1!
+# If this environment variable is set to 1 (or true/yes), executables are run to
+# check that they report the expected program name, rather than only checking
+# that they exist
+STRICT_EXE_CHECK = os.environ.get("PYANI_STRICT_EXE_CHECK", "").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+def is_executable(path: str) -> bool:
+    """Return True if the passed path is an executable file."""
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def executables_exist(exes: Dict[str, Path]) -> Dict[str, bool]:
+    """Return dict of bools showing whether each executable can be found.
+
+    :param exes:  paths to, or names of, executables, keyed by program name
+
+    Explicit paths are checked directly. Bare executable names are looked
+    up together, in a single pass over the directories on $PATH that stops
+    once all names have been found. No process is started.
+    """
+    found = {}
+    on_path = {}
+    for name, exe in exes.items():
+        if os.path.dirname(str(exe)):
+            found[name] = is_executable(str(exe))
+        else:
+            on_path[name] = str(exe)
+    for dirname in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not on_path:
+            break
+        for name, exe in list(on_path.items()):
+            if is_executable(os.path.join(dirname, exe)):
+                found[name] = True
+                del on_path[name]
+    found.update({name: False for name in on_path})
+    return found
+
+
+def executable_reports(
+    cmd: List[str], name: bytes, offset: int = 0, stderr: bool = False
+) -> bool:
+    """Return True if running cmd reports the expected program name.
+
+    :param cmd:  command to run, as a list of arguments
+    :param name:  program name expected in the command's output
+    :param offset:  position of the program name in the output
+    :param stderr:  if True, read stderr rather than stdout
+
+    Only as many bytes as are needed to find the program name are read
+    from the process's output; the process is then killed.
+    """
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             shell=False,
-            check=False,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            stdout=subprocess.DEVNULL if stderr else subprocess.PIPE,
+            stderr=subprocess.PIPE if stderr else subprocess.DEVNULL,
         )
     except OSError:
         return False
-    return result.stdout[1:9] == b"blastall"
+    stream = proc.stderr if stderr else proc.stdout
+    head = stream.read(offset + len(name))
+    proc.kill()
+    proc.wait()
+    stream.close()
+    return head[offset:] == name
 
 
-@pytest.fixture
-def blastn_available():
+@lru_cache(maxsize=None)
+def check_executables() -> Dict[str, bool]:
+    """Return dict of bools showing whether each third-party executable is available.
+
+    Keyed by program name: blastall, blastn, nucmer
+
+    The result is cached, so the executables are checked once per session.
+    """
+    if STRICT_EXE_CHECK:
+        return {
+            # blastall without arguments prints usage, starting with a blank line
+            "blastall": executable_reports(
+                [str(BLASTALL_DEFAULT)], b"blastall", offset=1
+            ),
+            "blastn": executable_reports([str(BLASTN_DEFAULT), "-version"], b"blastn"),
+            "nucmer": executable_reports(
+                [str(NUCMER_DEFAULT), "--version"], b"nucmer", stderr=True
+            ),
+        }
+    return executables_exist(
+        {
+            "blastall": BLASTALL_DEFAULT,
+            "blastn": BLASTN_DEFAULT,
+            "nucmer": NUCMER_DEFAULT,
+        }
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip collected tests whose required executable is unavailable.
+
+    Use with @pytest.mark.skip_if_exe_missing("executable") decorator.
+    """
+    for item in items:
+        marker = item.get_closest_marker("skip_if_exe_missing")
+        if marker is None:
+            continue
+        exe_name = marker.args[0]
+        available = check_executables()
+        if exe_name not in available:  # Unknown executables are ignored
+            item.add_marker(
+                pytest.mark.skip(reason=f"Executable {exe_name} not recognised")
+            )
+        elif not available[exe_name]:
+            item.add_marker(
+                pytest.mark.skip(reason=f"Skipped as {exe_name} not available")
+            )
+
+
+@pytest.fixture(scope="session")
+def executables_available():
+    """Dict of bools showing whether each third-party executable is available."""
+    return check_executables()
+
+
+@pytest.fixture(scope="session")
+def blastall_available(executables_available):
+    """Returns True if blastall can be run, False otherwise."""
+    return executables_available["blastall"]
+
+
+@pytest.fixture(scope="session")
+def blastn_available(executables_available):
     """Returns True if blastn can be run, False otherwise."""
-    cmd = [str(BLASTN_DEFAULT), "-version"]
-    try:
-        result = subprocess.run(
-            cmd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
-        )
-    except OSError:
-        return False
-    return result.stdout[:6] == b"blastn"
+    return executables_available["blastn"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dir_anib_in():
     """Input files for ANIb tests."""
     return FIXTUREPATH / "anib"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dir_anim_in():
     """Input files for ANIm tests."""
     return FIXTUREPATH / "anim"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dir_graphics_in():
     """Input files for graphics tests."""
     return FIXTUREPATH / "graphics"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dir_seq():
     """Sequence files for tests."""
     return FIXTUREPATH / "sequences"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dir_targets():
     """Target files for output comparisons."""
     return FIXTUREPATH / "targets"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dir_tgt_fragments(dir_targets):
     """Target files for FASTA file fragmentation."""
     return dir_targets / "fragments"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def email_address():
     """Dummy email address."""
     return "pyani.tests@pyani.org"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def expected_result_dataframes(dir_anib_in, dir_anim_in):
+    """Expected ANIb and ANIm result matrices, keyed by analysis output.
+
+    blastn - pd.DataFrame result for BLAST+ ANIb
+    blastall - pd.DataFrame result for blastall ANIb
+    deltadir - pd.DataFrame result for ANIm
+
+    The .csv files are read concurrently, once per session; the pandas C
+    parser releases the GIL while tokenising.
+    """
+    paths = {
+        "blastn": dir_anib_in / "dataframes" / "blastn_result.csv",
+        "blastall": dir_anib_in / "dataframes" / "blastall_result.csv",
+        "deltadir": dir_anim_in / "dataframes" / "deltadir_result.csv",
+    }
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        futures = {
+            name: executor.submit(read_matrix_csv, path) for name, path in paths.items()
+        }
+    return {name: future.result() for name, future in futures.items()}
+
+
+@pytest.fixture(scope="session")
 def fragment_length():
     """Fragment size for ANIb-related analyses."""
     return FRAGSIZE
 
 
-@pytest.fixture
-def nucmer_available():
+@pytest.fixture(scope="session")
+def nucmer_available(executables_available):
     """Test that nucmer is available."""
-    cmd = [str(NUCMER_DEFAULT), "--version"]
-    try:
-        result = subprocess.run(
-            cmd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
-        )
-    except OSError:
-        return False
-    return result.stderr[:6] == b"nucmer"
+    return executables_available["nucmer"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def path_file_two():
     """Path to two arbitrary filenames."""
-    return [Path(f"file{_:d}.fna") for _ in range(1, 3)]
+    return PATH_FILE_FOUR[:2]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def path_file_four():
     """Path to four arbitrary filenames."""
-    return [Path(f"file{_:d}.fna") for _ in range(1, 5)]
+    return PATH_FILE_FOUR
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def path_fixtures_base():
     """Base path to fixture data folders."""
     return FIXTUREPATH
 
 
+@pytest.fixture(scope="session")
+def paths_seq_fna(dir_seq):
+    """Paths to all .fna sequence files in dir_seq, scanned once per session."""
+    return get_fna_paths(dir_seq)
+
+
 @pytest.fixture
-def path_fna(dir_seq):
+def path_fna(paths_seq_fna):
     """Path to one .fna sequence file from dir_seq."""
-    fnapaths = [_ for _ in dir_seq.iterdir() if _.is_file() and _.suffix == ".fna"]
-    return fnapaths[0]
+    return paths_seq_fna[0]
 
 
 @pytest.fixture
-def path_fna_two(dir_seq):
+def path_fna_two(paths_seq_fna):
     """Paths to two .fna sequence file in dir_seq."""
-    fnapaths = [_ for _ in dir_seq.iterdir() if _.is_file() and _.suffix == ".fna"]
-    return fnapaths[:2]
+    return paths_seq_fna[:2]
 
 
 @pytest.fixture
-def path_fna_all(dir_seq):
+def path_fna_all(paths_seq_fna):
     """Paths to all .fna sequence file in dir_seq."""
-    return [_ for _ in dir_seq.iterdir() if _.is_file() and _.suffix == ".fna"]
-
-
-@pytest.fixture(autouse=True)
-def skip_by_unavailable_executable(
-    request, blastall_available, blastn_available, nucmer_available
-):
-    """Skip test if executable is unavailable.
-
-    Use with @pytest.mark.skip_if_exe_missing("executable") decorator.
-    """
-    if request.node.get_closest_marker("skip_if_exe_missing"):
-        exe_name = request.node.get_closest_marker("skip_if_exe_missing").args[0]
-        tests = {
-            "blastall": blastall_available,
-            "blastn": blastn_available,
-            "nucmer": nucmer_available,
-        }
-        try:
-            if not tests[exe_name]:
-                pytest.skip(f"Skipped as {exe_name} not available")
-        except KeyError:  # Unknown executables are ignored
-            pytest.skip(f"Executable {exe_name} not recognised")
+    return list(paths_seq_fna)
 
 
 @pytest.fixture
@@ -223,6 +329,9 @@ def mock_single_genome_dl(monkeypatch):
 
     This masks calls to the download module, for safe testing.
     """
+    # Imported here, as only the download tests need these modules
+    from pyani import download
+    from pyani.download import ASMIDs, DLStatus
 
     def mock_asmuids(*args, **kwargs):
         """Mock download.get_asm_uids()."""
@@ -241,18 +350,21 @@ def mock_single_genome_dl(monkeypatch):
             "GCF_000011605.1_ASM1160v1",
         )
 
+    # The mocked download status is fixed, so is built once per fixture call
+    genome_dl_status = DLStatus(
+        "ftp://ftp.ncbi.nlm.nih.gov/dummy_genomic.fna.gz",
+        "ftp://ftp.ncbi.nlm.nih.gov/dummy/md5checksums.txt",
+        FIXTUREPATH
+        / "single_genome_download"
+        / "GCF_000011605.1_ASM1160v1_genomic.fna.gz",
+        FIXTUREPATH / "single_genome_download" / "GCF_000011605.1_ASM1160v1_hashes.txt",
+        False,
+        None,
+    )
+
     def mock_genome_hash(*args, **kwargs):
         """Mock download.retrieve_genome_and_hash()."""
-        return DLStatus(
-            "ftp://ftp.ncbi.nlm.nih.gov/dummy_genomic.fna.gz",
-            "ftp://ftp.ncbi.nlm.nih.gov/dummy/md5checksums.txt",
-            FIXTUREPATH
-            / "single_genome_download"
-            / "GCF_000011605.1_ASM1160v1_genomic.fna.gz",
-            FIXTUREPATH / "single_genome_download/GCF_000011605.1_ASM1160v1_hashes.txt",
-            False,
-            None,
-        )
+        return genome_dl_status
 
     monkeypatch.setattr(download, "get_asm_uids", mock_asmuids)
     monkeypatch.setattr(download, "get_ncbi_esummary", mock_ncbi_esummary)
@@ -268,21 +380,26 @@ def mock_legacy_single_genome_dl(monkeypatch):
     This will be deprecated once the genbank_get_genomes_by_taxon.py script is
     converted to use the pyani.download module.
     """
+    # Imported here, as only the legacy script tests need this module
+    from pyani.scripts import genbank_get_genomes_by_taxon
 
     def mock_asmuids(*args, **kwargs):
         """Mock genbank_get_genomes_by_taxon.get_asm_uids()."""
         return ["32728"]
 
+    # The mocked assembly data is fixed, so is built once per fixture call
+    ncbi_asm = (
+        Path(
+            "tests/test_output/legacy_scripts/C_blochmannia_legacy/GCF_000011605.1_ASM1160v1_genomic.fna"
+        ),
+        "8b0cab310cb638c977d453ff06eceb64\tGCF_000011605.1_ASM1160v1_genomic\tPectobacterium atrosepticum",
+        "8b0cab310cb638c977d453ff06eceb64\tGCF_000011605.1_ASM1160v1_genomic\tP. atrosepticum SCRI1043",
+        "GCF_000011605.1",
+    )
+
     def mock_ncbi_asm(*args, **kwargs):
         """Mock genbank_get_genomes_by_taxon.get_ncbi_asm()."""
-        return (
-            Path(
-                "tests/test_output/legacy_scripts/C_blochmannia_legacy/GCF_000011605.1_ASM1160v1_genomic.fna"
-            ),
-            "8b0cab310cb638c977d453ff06eceb64\tGCF_000011605.1_ASM1160v1_genomic\tPectobacterium atrosepticum",
-            "8b0cab310cb638c977d453ff06eceb64\tGCF_000011605.1_ASM1160v1_genomic\tP. atrosepticum SCRI1043",
-            "GCF_000011605.1",
-        )
+        return ncbi_asm
 
     monkeypatch.setattr(genbank_get_genomes_by_taxon, "get_asm_uids", mock_asmuids)
     monkeypatch.setattr(genbank_get_genomes_by_taxon, "get_ncbi_asm", mock_ncbi_asm)
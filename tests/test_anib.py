@@ -43,15 +43,18 @@ These tests are intended to be run from the repository root using:
 pytest -v
 """
 
+import shutil
+
 from pathlib import Path
 from typing import List, NamedTuple
 
 import pandas as pd
-import pytest  # noqa: F401  # pylint: disable=unused-import
+import pytest
 
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 
-from pyani import anib, pyani_files
+from pyani import __version__, anib, pyani_config, pyani_files
+from tools import get_fna_paths
 
 
 class ANIbOutput(NamedTuple):
@@ -90,8 +93,20 @@ def anib_output(dir_anib_in):
     )
 
 
-@pytest.fixture
-def anib_output_dir(dir_anib_in):
+@pytest.fixture(scope="session")
+def anib_result_dataframes(expected_result_dataframes):
+    """Expected BLAST+ and blastall ANIb results, parsed once per session.
+
+    Returns a tuple ``(blastresult, legacyblastresult)`` of pd.DataFrames.
+    """
+    return (
+        expected_result_dataframes["blastn"],
+        expected_result_dataframes["blastall"],
+    )
+
+
+@pytest.fixture(scope="session")
+def anib_output_dir(dir_anib_in, anib_result_dataframes):
     """Namedtuple of example ANIb output - full directory.
 
     infiles - list of FASTA query files
@@ -102,20 +117,11 @@ def anib_output_dir(dir_anib_in):
     legacyblastresult - pd.DataFrame result for blastall
     """
     return ANIbOutputDir(
-        [
-            _
-            for _ in (dir_anib_in / "sequences").iterdir()
-            if _.is_file() and _.suffix == ".fna"
-        ],
-        [
-            _
-            for _ in (dir_anib_in / "fragfiles").iterdir()
-            if _.is_file() and _.suffix == ".fna"
-        ],
+        get_fna_paths(dir_anib_in / "sequences"),
+        get_fna_paths(dir_anib_in / "fragfiles"),
         dir_anib_in / "blastn",
         dir_anib_in / "blastall",
-        pd.read_csv(dir_anib_in / "dataframes" / "blastn_result.csv", index_col=0),
-        pd.read_csv(dir_anib_in / "dataframes" / "blastall_result.csv", index_col=0),
+        *anib_result_dataframes,
     )
 
 
@@ -128,7 +134,7 @@ def test_blastall_dbjobdict(path_fna_all, tmp_path):
         (tmp_path / _.name, f"formatdb -p F -i {tmp_path / _.name} -t {_.stem}")
         for _ in path_fna_all
     ]
-    assert sorted([(k, v.script) for (k, v) in jobdict.items()]) == sorted(expected)
+    assert {k: v.script for (k, v) in jobdict.items()} == dict(expected)
 
 
 def test_blastall_graph(path_fna_all, tmp_path, fragment_length):
@@ -146,7 +152,9 @@ def test_blastall_graph(path_fna_all, tmp_path, fragment_length):
 
 def test_blastall_multiple(path_fna_two, tmp_path):
     """Generate legacy BLASTN commands."""
-    cmds = anib.generate_blastn_commands(path_fna_two, tmp_path, mode="ANIblastall")
+    cmds = list(
+        anib.generate_blastn_commands(path_fna_two, tmp_path, mode="ANIblastall")
+    )
     expected = [
         (
             "blastall -p blastn -o "
@@ -190,7 +198,7 @@ def test_blastn_dbjobdict(path_fna_all, tmp_path):
         )
         for _ in path_fna_all
     ]
-    assert sorted([(k, v.script) for (k, v) in jobdict.items()]) == sorted(expected)
+    assert {k: v.script for (k, v) in jobdict.items()} == dict(expected)
 
 
 def test_blastn_graph(path_fna_all, tmp_path, fragment_length):
@@ -206,10 +214,40 @@ def test_blastn_graph(path_fna_all, tmp_path, fragment_length):
         assert job.dependencies[0].script.startswith("makeblastdb")
 
 
+def test_blastn_graph_threads(path_fna_all, tmp_path, fragment_length):
+    """Create jobgraph for BLASTN+ jobs using several threads."""
+    fragresult = anib.fragment_fasta_files(path_fna_all, tmp_path, fragment_length)
+    blastcmds = anib.make_blastcmd_builder("ANIb", tmp_path, threads=4)
+    jobgraph = anib.make_job_graph(path_fna_all, fragresult[0], blastcmds)
+    for job in jobgraph:
+        assert job.script.endswith("-task blastn -num_threads 4")
+
+
+def test_blastn_graph_batched(path_fna_all, tmp_path, fragment_length):
+    """Create jobgraph for batched BLASTN+ jobs, one per database."""
+    fragresult = anib.fragment_fasta_files(path_fna_all, tmp_path, fragment_length)
+    blastcmds = anib.make_blastcmd_builder("ANIb", tmp_path, batch=True)
+    jobgraph = anib.make_job_graph(path_fna_all, fragresult[0], blastcmds)
+    assert len(jobgraph) == len(path_fna_all)
+    for job, fragfile in zip(jobgraph, fragresult[0]):
+        queryfile = anib.get_batch_query_name(fragfile, tmp_path)
+        assert f" -query {queryfile} " in job.script
+        assert job.dependencies[0].script.startswith("makeblastdb")
+
+
+def test_blastn_graph_shared_dbs(path_fna_all, tmp_path, fragment_length):
+    """Each BLASTN+ database is built by one job, shared by all its searches."""
+    fragresult = anib.fragment_fasta_files(path_fna_all, tmp_path, fragment_length)
+    blastcmds = anib.make_blastcmd_builder("ANIb", tmp_path)
+    jobgraph = anib.make_job_graph(path_fna_all, fragresult[0], blastcmds)
+    dbjobs = {id(job.dependencies[0]) for job in jobgraph}
+    assert len(dbjobs) == len(path_fna_all)
+
+
 def test_blastn_multiple(path_fna_two, tmp_path):
     """Generate BLASTN+ commands."""
     # BLAST+
-    cmds = anib.generate_blastn_commands(path_fna_two, tmp_path, mode="ANIb")
+    cmds = list(anib.generate_blastn_commands(path_fna_two, tmp_path, mode="ANIb"))
     expected = [
         (
             f"blastn -out {tmp_path / str(path_fna_two[0].stem + '_vs_' + path_fna_two[1].stem + '.blast_tab')} "
@@ -233,6 +271,30 @@ def test_blastn_multiple(path_fna_two, tmp_path):
     assert cmds == expected
 
 
+def test_blastn_batch(path_fna_two, tmp_path):
+    """Generate batched BLASTN+ commands, one per database."""
+    queryfiles = anib.write_batch_queries(path_fna_two, tmp_path)
+    cmds = list(
+        anib.generate_blastn_commands(path_fna_two, tmp_path, mode="ANIb", batch=True)
+    )
+    expected = [
+        (
+            f"blastn -out {tmp_path / str(dbname.stem + '.blast_batch')} "
+            f"-query {tmp_path / str(dbname.stem + '.blast_batch.fna')} "
+            f"-db {dbname} "
+            "-xdrop_gap_final 150 -dust no -evalue 1e-15 -max_target_seqs 1 "
+            "-outfmt '6 qseqid sseqid length mismatch pident nident qlen slen "
+            "qstart qend sstart send positive ppos gaps' "
+            "-task blastn"
+        )
+        for dbname in path_fna_two
+    ]
+    assert cmds == expected
+    assert queryfiles[0] == tmp_path / f"{path_fna_two[0].stem}.blast_batch.fna"
+    with queryfiles[0].open() as ifh:
+        assert ifh.readline().startswith(f">{path_fna_two[1].stem}-")
+
+
 def test_blastn_single(path_fna_two, tmp_path):
     """Generate BLASTN+ command-line."""
     cmd = anib.construct_blastn_cmdline(path_fna_two[0], path_fna_two[1], tmp_path)
@@ -248,10 +310,32 @@ def test_blastn_single(path_fna_two, tmp_path):
     assert cmd == expected
 
 
+def test_blastn_single_threads(path_fna_two, tmp_path):
+    """Generate BLASTN+ command-line using several threads."""
+    cmd = anib.construct_blastn_cmdline(
+        path_fna_two[0], path_fna_two[1], tmp_path, threads=4
+    )
+    assert cmd.endswith("-task blastn -num_threads 4")
+
+
+def test_blastn_single_megablast(path_fna_two, tmp_path):
+    """Generate BLASTN+ command-line using megablast."""
+    cmd = anib.construct_blastn_cmdline(
+        path_fna_two[0], path_fna_two[1], tmp_path, task="megablast"
+    )
+    assert cmd.endswith("gaps' -task megablast -word_size 28")
+    cmd = anib.construct_blastn_cmdline(
+        path_fna_two[0], path_fna_two[1], tmp_path, task="megablast", word_size=20
+    )
+    assert cmd.endswith("gaps' -task megablast -word_size 20")
+
+
 # Test legacy BLAST database formatting (formatdb) command generation
 def test_formatdb_multiple(path_fna_two, tmp_path):
     """Generate legacy BLAST db creation commands."""
-    cmds = anib.generate_blastdb_commands(path_fna_two, tmp_path, mode="ANIblastall")
+    cmds = list(
+        anib.generate_blastdb_commands(path_fna_two, tmp_path, mode="ANIblastall")
+    )
     expected = [
         (
             f"formatdb -p F -i {tmp_path / path_fna_two[0].name} -t {path_fna_two[0].stem}",
@@ -286,7 +370,7 @@ def test_fragment_files(path_fna_all, tmp_path, dir_tgt_fragments, fragment_leng
 # Test BLAST+ database formatting (makeblastdb) command generation
 def test_makeblastdb_multiple(path_fna_two, tmp_path):
     """Generate multiple BLAST+ makeblastdb command-lines."""
-    cmds = anib.generate_blastdb_commands(path_fna_two, tmp_path, mode="ANIb")
+    cmds = list(anib.generate_blastdb_commands(path_fna_two, tmp_path, mode="ANIb"))
     expected = [
         (
             (
@@ -317,30 +401,133 @@ def test_makeblastdb_single(path_fna, tmp_path):
 
 
 # Test output file parsing for ANIb methods
-def test_parse_legacy_blastdir(anib_output_dir):
+def test_parse_legacy_blastdir(anib_output_dir, tmp_path):
     """Parses directory of legacy BLAST output."""
+    blastdir = shutil.copytree(anib_output_dir.legacyblastdir, tmp_path / "blastall")
     orglengths = pyani_files.get_sequence_lengths(anib_output_dir.infiles)
     fraglengths = anib.get_fraglength_dict(anib_output_dir.fragfiles)
-    result = anib.process_blast(
-        anib_output_dir.legacyblastdir, orglengths, fraglengths, mode="ANIblastall"
-    )
+    result = anib.process_blast(blastdir, orglengths, fraglengths, mode="ANIblastall")
     assert_frame_equal(
-        result.percentage_identity.sort_index(1).sort_index(),
-        anib_output_dir.legacyblastresult.sort_index(1).sort_index(),
+        result.percentage_identity, anib_output_dir.legacyblastresult, check_like=True
     )
 
 
-def test_parse_blastdir(anib_output_dir):
+def test_parse_blastdir(anib_output_dir, tmp_path):
     """Parse directory of BLAST+ output."""
+    blastdir = shutil.copytree(anib_output_dir.blastdir, tmp_path / "blastn")
     orglengths = pyani_files.get_sequence_lengths(anib_output_dir.infiles)
     fraglengths = anib.get_fraglength_dict(anib_output_dir.fragfiles)
+    result = anib.process_blast(blastdir, orglengths, fraglengths, mode="ANIb")
+    assert not list(blastdir.glob(f"{pyani_config.BLAST_PARSE_CACHE}*"))
+    assert_frame_equal(
+        result.percentage_identity, anib_output_dir.blastresult, check_like=True
+    )
+
+
+def test_parse_blastdir_cached(anib_output_dir, tmp_path):
+    """Reparse directory of BLAST+ output from the cache of parsed results."""
+    blastdir = shutil.copytree(anib_output_dir.blastdir, tmp_path / "blastn")
+    orglengths = pyani_files.get_sequence_lengths(anib_output_dir.infiles)
+    fraglengths = anib.get_fraglength_dict(anib_output_dir.fragfiles)
+    first = anib.process_blast(
+        blastdir, orglengths, fraglengths, mode="ANIb", cache=True
+    )
+    for tabfile in blastdir.glob("*.blast_tab"):  # cached values must be used
+        tabfile.with_suffix(".blast_tab.dataframe").unlink()
+    second = anib.process_blast(
+        blastdir, orglengths, fraglengths, mode="ANIb", cache=True
+    )
+    assert not list(blastdir.glob("*.blast_tab.dataframe"))
+    assert_frame_equal(first.percentage_identity, second.percentage_identity)
+
+
+def test_parse_cache_key(anib_output_dir):
+    """Cache keys for parsed BLASTALL output depend on fragment lengths."""
+    tabfile = next(anib_output_dir.legacyblastdir.glob("*.blast_tab"))
+    fraglengths = anib.get_fraglength_dict(anib_output_dir.fragfiles)
+    qfraglengths = fraglengths[tabfile.stem.split("_vs_")[0]]
+    digest = anib.get_fraglength_digest(qfraglengths)
+    changed = anib.get_fraglength_digest({**qfraglengths, "frag00001": 1})
+    key = anib.get_parse_cache_key(tabfile, "ANIblastall", digest)
+    assert key.startswith(f"{__version__}:{tabfile.name}:")
+    assert key != anib.get_parse_cache_key(tabfile, "ANIblastall", changed)
+
+
+def test_parse_blastdir_batched(anib_output_dir, tmp_path):
+    """Parse directory of batched BLAST+ output."""
+    anib.write_batch_queries(anib_output_dir.fragfiles, tmp_path)
+    for dbfile in anib_output_dir.fragfiles:
+        sname = dbfile.stem.replace("-fragments", "")
+        queries = [_ for _ in anib_output_dir.fragfiles if _ != dbfile]
+        with (tmp_path / f"{sname}.blast_batch").open("w") as ofh:
+            for query in queries:
+                qname = query.stem.replace("-fragments", "")
+                tabfile = anib_output_dir.blastdir / f"{qname}_vs_{sname}.blast_tab"
+                ofh.writelines(f"{qname}-{_}" for _ in tabfile.open())
+    orglengths = pyani_files.get_sequence_lengths(anib_output_dir.infiles)
+    fraglengths = anib.get_fraglength_dict(anib_output_dir.fragfiles)
+    anib.process_blast(tmp_path, orglengths, fraglengths, mode="ANIb")
+    assert not list(tmp_path.glob("*.blast_tab"))  # only split when batched
     result = anib.process_blast(
-        anib_output_dir.blastdir, orglengths, fraglengths, mode="ANIb"
+        tmp_path, orglengths, fraglengths, mode="ANIb", batch=True
+    )
+    assert_frame_equal(
+        result.percentage_identity, anib_output_dir.blastresult, check_like=True
+    )
+
+
+def test_split_blast_batches(anib_output_dir, tmp_path):
+    """Split batched BLAST+ output for the expected genomes only."""
+    genomes = [_.stem for _ in anib_output_dir.infiles]
+    batchfile = tmp_path / f"{genomes[0]}.blast_batch"
+    batchfile.write_text(f"{genomes[1]}-frag00001\tsubject\t100\n")
+    tabfiles = anib.split_blast_batches(tmp_path, genomes)  # no query files
+    assert sorted(tabfiles) == sorted(
+        tmp_path / f"{_}_vs_{genomes[0]}.blast_tab" for _ in genomes[1:]
+    )
+    assert (tmp_path / f"{genomes[1]}_vs_{genomes[0]}.blast_tab").read_text() == (
+        "frag00001\tsubject\t100\n"
+    )
+    assert anib.split_blast_batches(tmp_path, genomes[1:]) == []  # unknown subject
+    for tabfile in tabfiles:  # so that the batch is split again
+        tabfile.unlink()
+    batchfile.write_text("unexpected-frag00001\tsubject\t100\n")
+    with pytest.raises(anib.PyaniANIbException):
+        anib.split_blast_batches(tmp_path, genomes)
+
+
+def test_duplicate_genomes(path_fna_two, tmp_path):
+    """Identify input genomes with identical contents."""
+    dupfile = Path(shutil.copy(path_fna_two[0], tmp_path / "duplicate.fna"))
+    duplicates = anib.get_duplicate_genomes(list(path_fna_two) + [dupfile])
+    assert duplicates == {"duplicate": path_fna_two[0].stem}
+
+
+def test_parse_blastdir_duplicates(anib_output_dir, tmp_path):
+    """Copy BLAST+ results to a genome identical to a compared genome."""
+    blastdir = shutil.copytree(anib_output_dir.blastdir, tmp_path / "blastn")
+    orglengths = pyani_files.get_sequence_lengths(anib_output_dir.infiles)
+    fraglengths = anib.get_fraglength_dict(anib_output_dir.fragfiles)
+    name = anib_output_dir.infiles[0].stem
+    orglengths["duplicate"] = orglengths[name]
+    results = anib.process_blast(
+        blastdir,
+        orglengths,
+        fraglengths,
+        mode="ANIb",
+        duplicates={"duplicate": name},
     )
+    result = results.percentage_identity
     assert_frame_equal(
-        result.percentage_identity.sort_index(1).sort_index(),
-        anib_output_dir.blastresult.sort_index(1).sort_index(),
+        result.drop(index="duplicate", columns="duplicate"),
+        anib_output_dir.blastresult,
+        check_like=True,
     )
+    others = [_ for _ in result.columns if _ not in ("duplicate", name)]
+    assert result.loc["duplicate", others].equals(result.loc[name, others])
+    assert (result.loc["duplicate", name], result.loc[name, "duplicate"]) == (1, 1)
+    lengths = results.alignment_lengths.loc[["duplicate", name], ["duplicate", name]]
+    assert (lengths.values == orglengths[name]).all()
 
 
 def test_parse_blasttab(anib_output):
@@ -52,7 +52,7 @@ from typing import List, NamedTuple, Tuple
 import pandas as pd
 import pytest
 
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 
 from pyani import anim, pyani_files, pyani_tools
 
@@ -83,13 +83,17 @@ class MUMmerExample(NamedTuple):
     fcmds: List[str]
 
 
+@pytest.fixture(scope="session")
+def delta_result_dataframe(expected_result_dataframes):
+    """Expected ANIm result for the .delta file directory, parsed once per session."""
+    return expected_result_dataframes["deltadir"]
+
+
 @pytest.fixture
-def delta_output_dir(dir_anim_in):
+def delta_output_dir(dir_anim_in, delta_result_dataframe):
     """Namedtuple of example MUMmer .delta file output."""
     return DeltaDir(
-        dir_anim_in / "sequences",
-        dir_anim_in / "deltadir",
-        pd.read_csv(dir_anim_in / "dataframes" / "deltadir_result.csv", index_col=0),
+        dir_anim_in / "sequences", dir_anim_in / "deltadir", delta_result_dataframe
     )
 
 
@@ -99,51 +103,55 @@ def deltafile_parsed(dir_anim_in):
     return DeltaParsed(dir_anim_in / "test.delta", (4074148, 2191))
 
 
-@pytest.fixture
+# Expected MUMmer commands for the four files in path_file_four
+MUMMER_NCMDS_FOUR = (
+    "nucmer --mum -p nucmer_output/file1_vs_file2 file1.fna file2.fna",
+    "nucmer --mum -p nucmer_output/file1_vs_file3 file1.fna file3.fna",
+    "nucmer --mum -p nucmer_output/file1_vs_file4 file1.fna file4.fna",
+    "nucmer --mum -p nucmer_output/file2_vs_file3 file2.fna file3.fna",
+    "nucmer --mum -p nucmer_output/file2_vs_file4 file2.fna file4.fna",
+    "nucmer --mum -p nucmer_output/file3_vs_file4 file3.fna file4.fna",
+)
+
+MUMMER_FCMDS_FOUR = (
+    (
+        "delta_filter_wrapper.py delta-filter -1 "
+        "nucmer_output/file1_vs_file2.delta "
+        "nucmer_output/file1_vs_file2.filter"
+    ),
+    (
+        "delta_filter_wrapper.py delta-filter -1 "
+        "nucmer_output/file1_vs_file3.delta "
+        "nucmer_output/file1_vs_file3.filter"
+    ),
+    (
+        "delta_filter_wrapper.py delta-filter -1 "
+        "nucmer_output/file1_vs_file4.delta "
+        "nucmer_output/file1_vs_file4.filter"
+    ),
+    (
+        "delta_filter_wrapper.py delta-filter -1 "
+        "nucmer_output/file2_vs_file3.delta "
+        "nucmer_output/file2_vs_file3.filter"
+    ),
+    (
+        "delta_filter_wrapper.py delta-filter -1 "
+        "nucmer_output/file2_vs_file4.delta "
+        "nucmer_output/file2_vs_file4.filter"
+    ),
+    (
+        "delta_filter_wrapper.py delta-filter -1 "
+        "nucmer_output/file3_vs_file4.delta "
+        "nucmer_output/file3_vs_file4.filter"
+    ),
+)
+
+
+@pytest.fixture(scope="session")
 def mummer_cmds_four(path_file_four):
     """Example MUMmer commands (four files)."""
     return MUMmerExample(
-        path_file_four,
-        [
-            "nucmer --mum -p nucmer_output/file1_vs_file2 file1.fna file2.fna",
-            "nucmer --mum -p nucmer_output/file1_vs_file3 file1.fna file3.fna",
-            "nucmer --mum -p nucmer_output/file1_vs_file4 file1.fna file4.fna",
-            "nucmer --mum -p nucmer_output/file2_vs_file3 file2.fna file3.fna",
-            "nucmer --mum -p nucmer_output/file2_vs_file4 file2.fna file4.fna",
-            "nucmer --mum -p nucmer_output/file3_vs_file4 file3.fna file4.fna",
-        ],
-        [
-            (
-                "delta_filter_wrapper.py delta-filter -1 "
-                "nucmer_output/file1_vs_file2.delta "
-                "nucmer_output/file1_vs_file2.filter"
-            ),
-            (
-                "delta_filter_wrapper.py delta-filter -1 "
-                "nucmer_output/file1_vs_file3.delta "
-                "nucmer_output/file1_vs_file3.filter"
-            ),
-            (
-                "delta_filter_wrapper.py delta-filter -1 "
-                "nucmer_output/file1_vs_file4.delta "
-                "nucmer_output/file1_vs_file4.filter"
-            ),
-            (
-                "delta_filter_wrapper.py delta-filter -1 "
-                "nucmer_output/file2_vs_file3.delta "
-                "nucmer_output/file2_vs_file3.filter"
-            ),
-            (
-                "delta_filter_wrapper.py delta-filter -1 "
-                "nucmer_output/file2_vs_file4.delta "
-                "nucmer_output/file2_vs_file4.filter"
-            ),
-            (
-                "delta_filter_wrapper.py delta-filter -1 "
-                "nucmer_output/file3_vs_file4.delta "
-                "nucmer_output/file3_vs_file4.filter"
-            ),
-        ],
+        path_file_four, list(MUMMER_NCMDS_FOUR), list(MUMMER_FCMDS_FOUR)
     )
 
 
@@ -154,8 +162,7 @@ def test_deltadir_parsing(delta_output_dir):
     orglengths = pyani_files.get_sequence_lengths(seqfiles)
     result = anim.process_deltadir(delta_output_dir.deltadir, orglengths)
     assert_frame_equal(
-        result.percentage_identity.sort_index(1).sort_index(),
-        delta_output_dir.deltaresult.sort_index(1).sort_index(),
+        result.percentage_identity, delta_output_dir.deltaresult, check_like=True
     )
 
 
@@ -51,7 +51,7 @@ from pathlib import Path
 import pytest
 
 from pyani import pyani_orm
-from pyani.scripts import pyani_script
+from pyani.scripts import average_nucleotide_identity, pyani_script
 
 
 @pytest.fixture
@@ -90,3 +90,14 @@ def test_download_single_genome(args_single_genome_download, mock_single_genome_
     We mock the remote database access
     """
     pyani_script.run_main(args_single_genome_download)
+
+
+def test_legacy_word_size_needs_megablast():
+    """Reject a BLASTN+ word size without megablast."""
+    argv = ["-i", "in", "-o", "out", "-m", "ANIb", "--word_size", "16"]
+    with pytest.raises(SystemExit):
+        average_nucleotide_identity.parse_cmdline(argv)
+    args = average_nucleotide_identity.parse_cmdline(
+        argv + ["--blastn_task", "megablast"]
+    )
+    assert args.word_size == 16
@@ -56,6 +56,7 @@ import pytest
 
 from pyani import run_multiprocessing as run_mp
 from pyani import anib, anim, tetra, pyani_files
+from tools import get_fna_paths
 
 
 def parse_jspecies(infile):
@@ -98,23 +99,19 @@ def parse_jspecies(infile):
     return dfs
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def paths_concordance_fna(path_fixtures_base):
     """Paths to FASTA inputs for concordance analysis."""
-    return [
-        _
-        for _ in (path_fixtures_base / "concordance").iterdir()
-        if _.is_file() and _.suffix == ".fna"
-    ]
+    return get_fna_paths(path_fixtures_base / "concordance")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def path_concordance_jspecies(path_fixtures_base):
     """Path to JSpecies analysis output."""
     return path_fixtures_base / "concordance/jspecies_output.tab"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def threshold_anib_lo_hi():
     """Threshold for concordance comparison split between high and low identity.
 
@@ -128,7 +125,7 @@ def threshold_anib_lo_hi():
     return 90
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tolerance_anib_hi():
     """Tolerance for ANIb concordance comparisons.
 
@@ -140,7 +137,7 @@ def tolerance_anib_hi():
     return 0.1
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tolerance_anib_lo():
     """Tolerance for ANIb concordance comparisons.
 
@@ -153,13 +150,13 @@ def tolerance_anib_lo():
     return 5
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tolerance_anim():
     """Tolerance for ANIm concordance comparisons."""
     return 0.1
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tolerance_tetra():
     """Tolerance for TETRA concordance comparisons."""
     return 0.1
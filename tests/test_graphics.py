@@ -67,7 +67,7 @@ class GraphicsTestInputs(NamedTuple):
     classes: Dict[str, str]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def graphics_inputs(dir_graphics_in):
     """Returns namedtuple of graphics inputs."""
     return GraphicsTestInputs(
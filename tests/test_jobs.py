@@ -61,53 +61,57 @@ class JobScript(NamedTuple):
     script: str
 
 
-@pytest.fixture
+# Fixed job scripts and commands, shared by all tests in this module
+JOB_DUMMY_CMDS = ("ls -ltrh", "echo ${PWD}")
+
+JOB_EMPTY_SCRIPT = 'let "TASK_ID=$SGE_TASK_ID - 1"\n\n\n\n'
+
+JOB_SCRIPTS = (
+    JobScript(
+        {"-f": ["file1", "file2", "file3"]},
+        (
+            'let "TASK_ID=$SGE_TASK_ID - 1"\n'
+            "-f_ARRAY=( file1 file2 file3  )\n\n"
+            'let "-f_INDEX=$TASK_ID % 3"\n'
+            "-f=${-f_ARRAY[$-f_INDEX]}\n"
+            'let "TASK_ID=$TASK_ID / 3"\n\n'
+            "cat\n"
+        ),
+    ),
+    JobScript(
+        {"-f": ["file1", "file2"], "--format": ["fmtA", "fmtB"]},
+        (
+            'let "TASK_ID=$SGE_TASK_ID - 1"\n'
+            "--format_ARRAY=( fmtA fmtB  )\n"
+            "-f_ARRAY=( file1 file2  )\n\n"
+            'let "--format_INDEX=$TASK_ID % 2"\n'
+            "--format=${--format_ARRAY[$--format_INDEX]}\n"
+            'let "TASK_ID=$TASK_ID / 2"\n'
+            'let "-f_INDEX=$TASK_ID % 2"\n'
+            "-f=${-f_ARRAY[$-f_INDEX]}\n"
+            'let "TASK_ID=$TASK_ID / 2"\n\n'
+            "myprog\n"
+        ),
+    ),
+)
+
+
+@pytest.fixture(scope="session")
 def job_dummy_cmds():
     """Dummy commands for testing job creation."""
-    return ["ls -ltrh", "echo ${PWD}"]
+    return JOB_DUMMY_CMDS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def job_empty_script():
     """Empty script for testing job creation."""
-    return 'let "TASK_ID=$SGE_TASK_ID - 1"\n\n\n\n'
+    return JOB_EMPTY_SCRIPT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def job_scripts():
     """Return two JobScript namedtuples for testing job creation."""
-    return (
-        JobScript(
-            {"-f": ["file1", "file2", "file3"]},
-            "".join(
-                [
-                    'let "TASK_ID=$SGE_TASK_ID - 1"\n',
-                    "-f_ARRAY=( file1 file2 file3  )\n\n",
-                    'let "-f_INDEX=$TASK_ID % 3"\n',
-                    "-f=${-f_ARRAY[$-f_INDEX]}\n",
-                    'let "TASK_ID=$TASK_ID / 3"\n\n',
-                    "cat\n",
-                ]
-            ),
-        ),
-        JobScript(
-            {"-f": ["file1", "file2"], "--format": ["fmtA", "fmtB"]},
-            "".join(
-                [
-                    'let "TASK_ID=$SGE_TASK_ID - 1"\n',
-                    "--format_ARRAY=( fmtA fmtB  )\n",
-                    "-f_ARRAY=( file1 file2  )\n\n",
-                    'let "--format_INDEX=$TASK_ID % 2"\n',
-                    "--format=${--format_ARRAY[$--format_INDEX]}\n",
-                    'let "TASK_ID=$TASK_ID / 2"\n',
-                    'let "-f_INDEX=$TASK_ID % 2"\n',
-                    "-f=${-f_ARRAY[$-f_INDEX]}\n",
-                    'let "TASK_ID=$TASK_ID / 2"\n\n',
-                    "myprog\n",
-                ]
-            ),
-        ),
-    )
+    return JOB_SCRIPTS
 
 
 def test_create_job():
@@ -48,8 +48,8 @@ pytest ordering plug-in is used to guarantee that the download script
 tests are conducted first.
 """
 
-from argparse import Namespace
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -65,11 +65,14 @@ from pyani.scripts import average_nucleotide_identity, genbank_get_genomes_by_ta
 from tools import modify_namespace
 
 
-@pytest.fixture
-def legacy_ani_namespace(path_fixtures_base, tmp_path):
-    """Base namespace for legacy average_nucleotide_identity.py tests."""
-    return Namespace(
-        outdirname=tmp_path,
+@pytest.fixture(scope="session")
+def legacy_ani_base_namespace(path_fixtures_base):
+    """Base namespace for legacy average_nucleotide_identity.py tests.
+
+    The output directory is not set here, as it must be unique to each test
+    (see legacy_ani_namespace).
+    """
+    return SimpleNamespace(
         indirname=path_fixtures_base / "legacy" / "ANI_input",
         verbose=False,
         debug=False,
@@ -78,6 +81,7 @@ def legacy_ani_namespace(path_fixtures_base, tmp_path):
         logfile=Path("test_ANIm.log"),
         skip_nucmer=False,
         skip_blastn=False,
+        parse_cache=False,
         noclobber=False,
         nocompress=False,
         graphics=True,
@@ -94,6 +98,10 @@ def legacy_ani_namespace(path_fixtures_base, tmp_path):
         nucmer_exe=NUCMER_DEFAULT,
         filter_exe=FILTER_DEFAULT,
         blastn_exe=BLASTN_DEFAULT,
+        blastn_task="blastn",
+        word_size=None,
+        blastn_threads=1,
+        blastn_batch=False,
         blastall_exe=BLASTALL_DEFAULT,
         makeblastdb_exe=MAKEBLASTDB_DEFAULT,
         formatdb_exe=FORMATDB_DEFAULT,
@@ -105,6 +113,12 @@ def legacy_ani_namespace(path_fixtures_base, tmp_path):
     )
 
 
+@pytest.fixture
+def legacy_ani_namespace(legacy_ani_base_namespace, tmp_path):
+    """Base namespace for legacy average_nucleotide_identity.py tests."""
+    return modify_namespace(legacy_ani_base_namespace, outdirname=tmp_path)
+
+
 @pytest.fixture
 def legacy_anib_sns_namespace(tmp_path, legacy_ani_namespace):
     """Namespace for legacy ANIm script tests.
@@ -144,7 +158,7 @@ def legacy_anim_mpl_namespace(tmp_path, legacy_ani_namespace):
 @pytest.fixture
 def legacy_download_namespace(tmp_path):
     """Namespace for legacy download script tests."""
-    return Namespace(
+    return SimpleNamespace(
         outdirname=tmp_path,
         taxon="203804",
         verbose=False,
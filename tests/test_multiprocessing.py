@@ -57,6 +57,7 @@ from pyani.run_multiprocessing import (
     multiprocessing_run,
     populate_cmdsets,
     run_dependency_graph,
+    split_cmdline,
 )
 
 
@@ -82,6 +83,18 @@ def test_multiprocessing_run(mp_cmdlist):
     assert 0 == result
 
 
+def test_split_cmdline(monkeypatch):
+    """Test that only command lines needing no shell are split into arguments."""
+    found = {"ls": "/bin/ls"}  # only ls is found on $PATH, whatever the host
+    monkeypatch.setattr("pyani.run_multiprocessing.which_exe", found.get)
+    args = split_cmdline("ls -ltrh '6 qseqid sseqid'")  # quoted argument
+    assert args == ["ls", "-ltrh", "6 qseqid sseqid"]
+    assert split_cmdline("echo ${PWD}") is None  # variable
+    assert split_cmdline("ls -ltrh > listing") is None  # redirection
+    assert split_cmdline("cd ..") is None  # not found on $PATH
+    assert split_cmdline("ls genome's.fna") is None  # unbalanced quote
+
+
 def test_cmdsets(mp_dummy_cmds):
     """Test that module builds command sets."""
     job1 = Job("dummy_with_dependency", mp_dummy_cmds[0])
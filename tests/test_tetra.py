@@ -52,7 +52,7 @@ from pathlib import Path
 
 import pandas as pd
 
-from pandas.util.testing import assert_frame_equal
+from pandas.testing import assert_frame_equal
 
 from pyani.tetra import (
     calculate_correlations,
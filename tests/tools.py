@@ -40,10 +40,13 @@
 # THE SOFTWARE.
 """Provides tools to support tests in the pyani package."""
 
-import copy
 import json
+import os
 import unittest
 
+from pathlib import Path
+from typing import List
+
 import pandas as pd
 
 from pyani import blast, nucmer
@@ -233,19 +236,58 @@ def ordered(obj):
         return obj
 
 
+def get_fna_paths(dirpath: Path) -> List[Path]:
+    """Return paths to the .fna files in the passed directory.
+
+    :param dirpath:  path to the directory to be scanned
+
+    os.scandir() is used rather than Path.iterdir(), as the file type of
+    each directory entry is cached from the directory listing, and does
+    not need a separate stat() call per file.
+
+    Path objects are returned, rather than the entries' path strings, as
+    the tests and the pyani functions they call use Path attributes such
+    as .stem and .name.
+    """
+    with os.scandir(dirpath) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".fna") and entry.is_file()
+        ]
+
+
+def read_matrix_csv(path: Path) -> pd.DataFrame:
+    """Return a square results matrix, read from the passed .csv file.
+
+    :param path:  path to the .csv file
+
+    The first row and column hold genome names; all other values are
+    floats. Column dtypes are given explicitly to pandas so that they are
+    not inferred while parsing.
+    """
+    with path.open("r") as ifh:
+        columns = ifh.readline().rstrip("\n").split(",")[1:]
+    return pd.read_csv(path, index_col=0, dtype={_: float for _ in columns}, engine="c")
+
+
 def modify_namespace(namespace, **kwargs):
     """Update arguments in a passed Namespace.
 
-    :param namespace:       argparse.Namespace object
+    :param namespace:       argparse.Namespace or types.SimpleNamespace object
     :param kwargs:          keyworded arguments
 
     The expected usage pattern is, for a command-line application with many
     or complex arguments, to define a base argparse.Namespace object, then
     change only a few arguments, specific to a test. This function takes
     a base namespace and a dictionary of argument: value pairs, and
-    returns the modified namespace.
+    returns the modified namespace, of the same type as the base namespace.
+
+    The base namespace is copied shallowly: argument values are expected to
+    be scalars or Paths, and are shared with the base namespace. The new
+    namespace's attribute dictionary is filled directly, rather than setting
+    each argument in turn through the namespace's __init__().
     """
-    new_namespace = copy.deepcopy(namespace)
-    for argname, argval in kwargs.items():
-        setattr(new_namespace, argname, argval)
+    new_namespace = type(namespace).__new__(type(namespace))
+    new_namespace.__dict__.update(vars(namespace), **kwargs)
     return new_namespace